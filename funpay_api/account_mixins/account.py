@@ -1,18 +1,15 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING, Literal
-from bs4 import BeautifulSoup
-import re
+from lxml import html as lxml_html
 
 from funpay_api.common import exceptions
 from .. import types
-from ..client import AsyncClient
+from funpay_api.common.parser import parse_user_profile
 
 if TYPE_CHECKING:
     from funpay_api.async_account import AsyncAccount as Account
 
-PRIVATE_CHAT_ID_RE = re.compile(r"users-\d+-\d+$")
-
 
 class AccountMixin:
     async def logout(self: Account) -> None:
@@ -21,10 +18,7 @@ class AccountMixin:
         """
         if not self.is_initiated:
             raise exceptions.AccountNotInitiatedError()
-        if isinstance(self.client, AsyncClient):
-            await self.client.get(self._logout_link, headers={"accept": "*/*"})
-        else:
-            self.client.get(self._logout_link, headers={"accept": "*/*"})
+        await self.client.get(self._logout_link, headers={"accept": "*/*"})
 
     @property
     def is_initiated(self: Account) -> bool:
@@ -46,8 +40,8 @@ class AccountMixin:
         html = json_responce["data"]["html"]
         if html:
             html = html["desktop"]
-            element = BeautifulSoup(html, "lxml").find("a")
-            link, text = element.get("href"), element.text
+            element = lxml_html.fragment_fromstring(html, create_parent="div").find(".//a")
+            link, text = (element.get("href"), element.text_content()) if element is not None else (None, None)
         else:
             html, link, text = None, None, None
 
@@ -55,7 +49,11 @@ class AccountMixin:
 
     @staticmethod
     def chat_id_private(chat_id: int | str):
-        return isinstance(chat_id, int) or PRIVATE_CHAT_ID_RE.fullmatch(chat_id)
+        if isinstance(chat_id, int):
+            return True
+        prefix, _, ids = chat_id.partition("-")
+        first, _, second = ids.partition("-")
+        return prefix == "users" and first.isdigit() and second.isdigit()
 
     @property
     def bot_character(self: Account) -> str:
@@ -89,10 +87,7 @@ class AccountMixin:
         if not locale:
             locale = self._profile_parse_locale
 
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.get(f"users/{user_id}/", headers={"accept": "*/*"}, locale=locale)
-        else:
-            response = self.client.get(f"users/{user_id}/", headers={"accept": "*/*"}, locale=locale)
+        response = await self.client.get(f"users/{user_id}/", headers={"accept": "*/*"}, locale=locale)
 
         if response.status_code != 200:
             raise exceptions.RequestFailedError(response)
@@ -101,5 +96,4 @@ class AccountMixin:
             self.locale = self._default_locale
         html_response = response.text
 
-        from funpay_api.common.parser import parse_user_profile
         return parse_user_profile(html_response, self, user_id)
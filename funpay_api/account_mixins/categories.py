@@ -1,13 +1,21 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
-from bs4 import BeautifulSoup
+from lxml import etree
 
 from funpay_api.common import enums
+from funpay_api.common.utils import xpath_class
 from .. import types
 
 if TYPE_CHECKING:
     from funpay_api.async_account import AsyncAccount as Account
 
+_TEXT = etree.XPath("string()", smart_strings=False)
+_GAMES_TABLES = etree.XPath(f"//div[{xpath_class('promo-game-list')}]")
+_GAME_ITEMS = etree.XPath(f".//div[{xpath_class('promo-game-item')}]")
+_GAME_TITLE = etree.XPath(f".//div[{xpath_class('game-title')}]")
+_REGIONAL_GROUP = etree.XPath(".//div[@role='group']")
+_SUBCATEGORY_LISTS = etree.XPath(f".//ul[{xpath_class('list-inline')}]")
+
 
 class CategoriesMixin:
     def get_category(self: Account, category_id: int) -> types.Category | None:
@@ -78,46 +86,47 @@ class CategoriesMixin:
         """
         return self._sorted_subcategories
 
-    def _setup_categories(self: Account, html: str):
+    def _setup_categories(self: Account, parser: etree._Element):
         """
         Парсит категории и подкатегории с основной страницы и добавляет их в свойства класса.
 
-        :param html: HTML страница.
+        :param parser: корневой элемент уже распарсенной основной страницы.
+        :type parser: :class:`lxml.etree._Element`
         """
-        parser = BeautifulSoup(html, "lxml")
-        games_table = parser.find_all("div", {"class": "promo-game-list"})
+        self._raise_payload_cache.clear()
+        self._sales_subcategories_cache = None
+        games_table = _GAMES_TABLES(parser)
         if not games_table:
             return
 
         games_table = games_table[1] if len(games_table) > 1 else games_table[0]
-        games_divs = games_table.find_all("div", {"class": "promo-game-item"})
+        games_divs = _GAME_ITEMS(games_table)
         if not games_divs:
             return
         game_position = 0
         subcategory_position = 0
         for i in games_divs:
-            gid = int(i.find("div", {"class": "game-title"}).get("data-id"))
-            gname = i.find("a").text
+            gid = int(_GAME_TITLE(i)[0].get("data-id"))
+            gname = _TEXT(i.find(".//a"))
             regional_games = {
                 gid: types.Category(gid, gname, position=game_position)
             }
             game_position += 1
-            if regional_divs := i.find("div", {"role": "group"}):
-                for btn in regional_divs.find_all("button"):
-                    regional_game_id = int(btn["data-id"])
-                    regional_games[regional_game_id] = types.Category(regional_game_id, f"{gname} ({btn.text})",
+            if regional_divs := _REGIONAL_GROUP(i):
+                for btn in regional_divs[0].iter("button"):
+                    regional_game_id = int(btn.get("data-id"))
+                    regional_games[regional_game_id] = types.Category(regional_game_id, f"{gname} ({_TEXT(btn)})",
                                                                       position=game_position)
                     game_position += 1
 
-            subcategories_divs = i.find_all("ul", {"class": "list-inline"})
+            subcategories_divs = _SUBCATEGORY_LISTS(i)
             for j in subcategories_divs:
-                j_game_id = int(j["data-id"])
-                subcategories = j.find_all("li")
-                for k in subcategories:
-                    a = k.find("a")
-                    name, link = a.text, a["href"]
+                j_game_id = int(j.get("data-id"))
+                for k in j.iter("li"):
+                    a = k.find(".//a")
+                    name, link = _TEXT(a), a.get("href")
                     stype = types.SubCategoryTypes.CURRENCY if "chips" in link else types.SubCategoryTypes.COMMON
-                    sid = int(link.split("/")[-2])
+                    sid = int(link.rsplit("/", 2)[-2])
                     sobj = types.SubCategory(sid, name, stype, regional_games[j_game_id], subcategory_position)
                     subcategory_position += 1
                     regional_games[j_game_id].add_subcategory(sobj)
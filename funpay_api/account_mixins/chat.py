@@ -2,16 +2,32 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Literal, Optional, IO
 
 from funpay_api.common import exceptions, utils
+from funpay_api.common.utils import ACCEPT_HEADERS, XHR_HEADERS, FORM_XHR_HEADERS
 from .. import types
-from funpay_api.client import AsyncClient
-from bs4 import BeautifulSoup
+from funpay_api.common.parser import parse_chat_history, parse_chats_histories, parse_chats, parse_chat
+from lxml import html as lxml_html
 from loguru import logger
-import json
 import time
 
 if TYPE_CHECKING:
     from funpay_api.async_account import AsyncAccount as Account
 
+_FLOOD_ERRORS = frozenset({
+    "Нельзя отправлять сообщения слишком часто.",
+    "You cannot send messages too frequently.",
+    "Не можна надсилати повідомлення занадто часто."
+})
+_MULTIUSER_FLOOD_ERRORS = frozenset({
+    "Нельзя слишком часто отправлять сообщения разным пользователям.",
+    "Не можна надто часто надсилати повідомлення різним користувачам.",
+    "You cannot message multiple users too frequently."
+})
+_CHAT_IMG_LINK_XPATH = f".//a[{utils.xpath_class('chat-img-link')}]"
+_CHAT_MSG_TEXT_XPATH = f".//div[{utils.xpath_class('chat-msg-text')}]"
+_CHAT_NODE_TAG = "00000000"
+_CHAT_BOOKMARKS_TEMPLATE = '[{"type":"chat_bookmarks","id":%d,"tag":"%s","data":false}]'
+_UPLOAD_URL = {"chat": "file/addChatImage", "offer": "file/addOfferImage"}
+
 
 class ChatMixin:
     async def get_chat_history(self: Account, chat_id: int | str, last_message_id: int = 99999999999999999999999,
@@ -38,21 +54,13 @@ class ChatMixin:
         if not self.is_initiated:
             raise exceptions.AccountNotInitiatedError()
 
-        headers = {
-            "accept": "*/*",
-            "x-requested-with": "XMLHttpRequest"
-        }
-
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.get(f"chat/history?node={chat_id}&last_message={last_message_id}", headers=headers)
-        else:
-            response = self.client.get(f"chat/history?node={chat_id}&last_message={last_message_id}", headers=headers)
+        url = f"chat/history?node={chat_id}&last_message={last_message_id}"
+        response = await self.client.get(url, headers=XHR_HEADERS)
 
         if response.status_code != 200:
             raise exceptions.RequestFailedError(response)
 
-        json_response = response.json()
-        from funpay_api.common.parser import parse_chat_history
+        json_response = utils.json_loads(response.content)
         return parse_chat_history(json_response, self, chat_id, interlocutor_username, from_id)
 
     async def get_chats_histories(self: Account, chats_data: dict[int | str, str | None],
@@ -69,33 +77,25 @@ class ChatMixin:
         :return: словарь с историями чатов в формате {ID чата: [список сообщений]}
         :rtype: :obj:`dict` {:obj:`int`: :obj:`list` of :class:`funpay_api.types.Message`}
         """
-        headers = {
-            "accept": "*/*",
-            "content-type": "application/x-www-form-urlencoded; charset=UTF-8",
-            "x-requested-with": "XMLHttpRequest"
-        }
-        chats = [{"type": "chat_node", "id": i, "tag": "00000000",
+        chats = [{"type": "chat_node", "id": i, "tag": _CHAT_NODE_TAG,
                   "data": {"node": i, "last_message": -1, "content": ""}} for i in chats_data]
+        random_tag = utils.random_tag
         buyers = [{"type": "c-p-u",
                    "id": str(buyer),
-                   "tag": utils.random_tag(),
+                   "tag": random_tag(),
                    "data": False} for buyer in interlocutor_ids or []]
         payload = {
-            "objects": json.dumps([*chats, *buyers]),
+            "objects": utils.json_dumps([*chats, *buyers]),
             "request": False,
             "csrf_token": self.csrf_token
         }
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.post("runner/", headers=headers, data=payload)
-        else:
-            response = self.client.post("runner/", headers=headers, data=payload)
+        response = await self.client.post("runner/", headers=FORM_XHR_HEADERS, data=payload)
 
         if response.status_code != 200:
             raise exceptions.RequestFailedError(response)
 
-        json_response = response.json()
+        json_response = utils.json_loads(response.content)
 
-        from funpay_api.common.parser import parse_chats_histories
         return parse_chats_histories(json_response, self, chats_data)
 
     async def upload_image(self: Account, image: str | IO[bytes], type_: Literal["chat", "offer"] = "chat") -> int:
@@ -123,19 +123,12 @@ class ChatMixin:
         else:
             files = {'file': image.read()}
 
-        headers = {
-            "accept": "*/*",
-            "x-requested-with": "XMLHttpRequest",
-        }
         # file/addChatImage, file/addOfferImage
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.post(f"file/add{type_.title()}Image", headers=headers, files=files)
-        else:
-            response = self.client.post(f"file/add{type_.title()}Image", headers=headers, files=files)
+        response = await self.client.post(_UPLOAD_URL[type_], headers=XHR_HEADERS, files=files)
 
         if response.status_code == 400:
             try:
-                json_response = response.json()
+                json_response = utils.json_loads(response.content)
                 message = json_response.get("msg")
                 raise exceptions.ImageUploadError(response, message)
             except Exception:
@@ -143,7 +136,7 @@ class ChatMixin:
         elif response.status_code != 200:
             raise exceptions.RequestFailedError(response)
 
-        if not (document_id := response.json().get("fileId")):
+        if not (document_id := utils.json_loads(response.content).get("fileId")):
             raise exceptions.ImageUploadError(response, None)
         return int(document_id)
 
@@ -184,11 +177,6 @@ class ChatMixin:
         if not self.is_initiated:
             raise exceptions.AccountNotInitiatedError()
 
-        headers = {
-            "accept": "*/*",
-            "content-type": "application/x-www-form-urlencoded; charset=UTF-8",
-            "x-requested-with": "XMLHttpRequest"
-        }
         request = {
             "action": "chat_message",
             "data": {"node": chat_id, "last_message": -1, "content": text}
@@ -200,77 +188,43 @@ class ChatMixin:
         else:
             request["data"]["content"] = f"{self.bot_character}{text}" if text else ""
 
-        objects = [
-            {
-                "type": "chat_node",
-                "id": chat_id,
-                "tag": "00000000",
-                "data": {"node": chat_id, "last_message": -1, "content": ""}
-            }
-        ]
+        if leave_as_unread:
+            objects = ""
+        else:
+            objects = utils.json_dumps([
+                {
+                    "type": "chat_node",
+                    "id": chat_id,
+                    "tag": _CHAT_NODE_TAG,
+                    "data": {"node": chat_id, "last_message": -1, "content": ""}
+                }
+            ])
         payload = {
-            "objects": "" if leave_as_unread else json.dumps(objects),
-            "request": json.dumps(request),
+            "objects": objects,
+            "request": utils.json_dumps(request),
             "csrf_token": self.csrf_token
         }
 
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.post("runner/", headers=headers, data=payload)
-        else:
-            response = self.client.post("runner/", headers=headers, data=payload)
+        response = await self.client.post("runner/", headers=FORM_XHR_HEADERS, data=payload)
 
         if response.status_code != 200:
             raise exceptions.RequestFailedError(response)
 
-        json_response = response.json()
+        json_response = utils.json_loads(response.content)
         if not (resp := json_response.get("response")):
             raise exceptions.MessageNotDeliveredError(response, None, chat_id)
 
         if (error_text := resp.get("error")) is not None:
-            if error_text in ("Нельзя отправлять сообщения слишком часто.",
-                              "You cannot send messages too frequently.",
-                              "Не можна надсилати повідомлення занадто часто."):
+            if error_text in _FLOOD_ERRORS:
                 self.last_flood_err_time = time.time()
-            elif error_text in ("Нельзя слишком часто отправлять сообщения разным пользователям.",
-                                "Не можна надто часто надсилати повідомлення різним користувачам.",
-                                "You cannot message multiple users too frequently."):
+            elif error_text in _MULTIUSER_FLOOD_ERRORS:
                 self.last_multiuser_flood_err_time = time.time()
             raise exceptions.MessageNotDeliveredError(response, error_text, chat_id)
         if leave_as_unread:
-            message_text = text
-            fake_html = f"""
-            <div class="chat-msg-item" id="message-0000000000">
-                <div class="chat-message">
-                    <div class="chat-msg-body">
-                        <div class="chat-msg-text">{message_text}</div>
-                    </div>
-                </div>
-            </div>
-            """
-            message_obj = types.Message(0, message_text, chat_id, chat_name, interlocutor_id, self.username, self.id,
-                                        fake_html, None,
-                                        None)
+            message_obj = types.Message(0, text, chat_id, chat_name, interlocutor_id, self.username, self.id,
+                                        None, None, None)
         else:
-            mes = json_response["objects"][0]["data"]["messages"][-1]
-            parser = BeautifulSoup(mes["html"].replace("<br>", "\n"), "lxml")
-            image_name = None
-            image_link = None
-            message_text = None
-            try:
-                if image_tag := parser.find("a", {"class": "chat-img-link"}):
-                    image_name = image_tag.find("img")
-                    image_name = image_name.get('alt') if image_name else None
-                    image_link = image_tag.get("href")
-                else:
-                    message_text = parser.find("div", {"class": "chat-msg-text"}).text. \
-                        replace(self.bot_character, "", 1)
-            except Exception as e:
-                logger.debug("SEND_MESSAGE RESPONSE")
-                logger.debug(response.content.decode())
-                raise e
-            message_obj = types.Message(int(mes["id"]), message_text, chat_id, chat_name, interlocutor_id,
-                                        self.username, self.id,
-                                        mes["html"], image_link, image_name)
+            message_obj = self._parse_sent_message(response, json_response, chat_id, chat_name, interlocutor_id)
         if self.runner and isinstance(chat_id, int):
             if add_to_ignore_list and message_obj.id:
                 self.runner.mark_as_by_bot(chat_id, message_obj.id)
@@ -278,6 +232,36 @@ class ChatMixin:
                 self.runner.update_last_message(chat_id, message_obj.id, message_obj.text)
         return message_obj
 
+    def _parse_sent_message(self: Account, response, json_response: dict, chat_id: int | str,
+                            chat_name: str | None, interlocutor_id: int | None) -> types.Message:
+        """
+        Парсит отправленное сообщение из ответа FunPay на запрос отправки.
+
+        :return: объект отправленного сообщения.
+        :rtype: :class:`funpay_api.types.Message`
+        """
+        mes = json_response["objects"][0]["data"]["messages"][-1]
+        parser = lxml_html.fragment_fromstring(mes["html"].replace("<br>", "\n"), create_parent="div")
+        image_name = None
+        image_link = None
+        message_text = None
+        try:
+            if image_tag := parser.xpath(_CHAT_IMG_LINK_XPATH):
+                image_tag = image_tag[0]
+                image_name = image_tag.find(".//img")
+                image_name = image_name.get('alt') if image_name is not None else None
+                image_link = image_tag.get("href")
+            else:
+                message_text = parser.xpath(_CHAT_MSG_TEXT_XPATH)[0].text_content(). \
+                    replace(self.bot_character, "", 1)
+        except Exception as e:
+            logger.debug("SEND_MESSAGE RESPONSE")
+            logger.debug(response.content.decode())
+            raise e
+        return types.Message(int(mes["id"]), message_text, chat_id, chat_name, interlocutor_id,
+                             self.username, self.id,
+                             mes["html"], image_link, image_name)
+
     async def send_image(self: Account, chat_id: int, image: int | str | IO[bytes], chat_name: Optional[str] = None,
                    interlocutor_id: Optional[int] = None,
                    add_to_ignore_list: bool = True, update_last_saved_message: bool = False,
@@ -328,31 +312,20 @@ class ChatMixin:
         :return: объекты чатов (не больше 50).
         :rtype: :obj:`list` of :class:`funpay_api.types.ChatShortcut`
         """
-        chats = {
-            "type": "chat_bookmarks",
-            "id": self.id,
-            "tag": utils.random_tag(),
-            "data": False
-        }
+        if not self.is_initiated:
+            raise exceptions.AccountNotInitiatedError()
+
         payload = {
-            "objects": json.dumps([chats]),
+            "objects": _CHAT_BOOKMARKS_TEMPLATE % (self.id, utils.random_tag()),
             "request": False,
             "csrf_token": self.csrf_token
         }
-        headers = {
-            "accept": "*/*",
-            "content-type": "application/x-www-form-urlencoded; charset=UTF-8",
-            "x-requested-with": "XMLHttpRequest"
-        }
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.post("https://funpay.com/runner/", headers=headers, data=payload)
-        else:
-            response = self.client.post("https://funpay.com/runner/", headers=headers, data=payload)
+        response = await self.client.post("https://funpay.com/runner/", headers=FORM_XHR_HEADERS, data=payload)
 
         if response.status_code != 200:
             raise exceptions.RequestFailedError(response)
 
-        json_response = response.json()
+        json_response = utils.json_loads(response.content)
 
         msgs = ""
         for obj in json_response["objects"]:
@@ -362,7 +335,6 @@ class ChatMixin:
         if not msgs:
             return []
 
-        from funpay_api.common.parser import parse_chats
         return parse_chats(msgs, self)
 
     async def get_chats(self: Account, update: bool = False) -> dict[int, types.ChatShortcut]:
@@ -398,13 +370,12 @@ class ChatMixin:
         if not self.is_initiated:
             raise exceptions.AccountNotInitiatedError()
 
-        for i in self._saved_chats:
-            if self._saved_chats[i].name == name:
-                return self._saved_chats[i]
+        if chat := self._saved_chats_by_name.get(name):
+            return chat
 
         if make_request:
             self.add_chats(await self.request_chats())
-            return await self.get_chat_by_name(name)
+            return self._saved_chats_by_name.get(name)
         else:
             return None
 
@@ -428,7 +399,7 @@ class ChatMixin:
             return self._saved_chats.get(chat_id)
 
         self.add_chats(await self.request_chats())
-        return await self.get_chat_by_id(chat_id)
+        return self._saved_chats.get(chat_id)
 
     async def get_chat(self: Account, chat_id: int, with_history: bool = True,
                  locale: Literal["ru", "en", "uk"] | None = None) -> types.Chat:
@@ -450,10 +421,8 @@ class ChatMixin:
         if not locale:
             locale = self._chat_parse_locale
 
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.get(f"chat/?node={chat_id}", headers={"accept": "*/*"}, locale=locale)
-        else:
-            response = self.client.get(f"chat/?node={chat_id}", headers={"accept": "*/*"}, locale=locale)
+        url = f"chat/?node={chat_id}"
+        response = await self.client.get(url, headers=ACCEPT_HEADERS, locale=locale)
 
         if response.status_code != 200:
             raise exceptions.RequestFailedError(response)
@@ -462,7 +431,6 @@ class ChatMixin:
             self.locale = self._default_locale
         html_response = response.text
 
-        from funpay_api.common.parser import parse_chat
         return parse_chat(html_response, self, chat_id, with_history)
 
     def add_chats(self: Account, chats: list[types.ChatShortcut]):
@@ -473,4 +441,8 @@ class ChatMixin:
         :type chats: :obj:`list` of :class:`funpay_api.types.ChatShortcut`
         """
         for i in chats:
+            if (old := self._saved_chats.get(i.id)) is not None and old.name != i.name \
+                    and self._saved_chats_by_name.get(old.name) is old:
+                del self._saved_chats_by_name[old.name]
             self._saved_chats[i.id] = i
+            self._saved_chats_by_name[i.name] = i
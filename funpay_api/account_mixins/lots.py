@@ -1,14 +1,21 @@
 from __future__ import annotations
+import asyncio
 from typing import TYPE_CHECKING, Literal
 
 from ..common import exceptions, enums, utils
+from ..common.utils import ACCEPT_HEADERS, FORM_XHR_HEADERS
 from .. import types
-from ..client import AsyncClient
-from bs4 import BeautifulSoup
+from ..common.parser import SubcategoryPublicLotsParser, parse_my_subcategory_lots, parse_lot_page, \
+    parse_html_bytes
+from bs4 import BeautifulSoup, SoupStrainer
+from loguru import logger
 
 if TYPE_CHECKING:
     from funpay_api.async_account import AsyncAccount as Account
 
+_INPUTS_STRAINER = SoupStrainer("input")
+_WAIT_PREFIXES = ("Подождите ", "Please wait ", "Зачекайте ")
+
 
 class LotsMixin:
     async def get_subcategory_public_lots(self: Account, subcategory_type: enums.SubCategoryTypes, subcategory_id: int,
@@ -32,20 +39,23 @@ class LotsMixin:
         if not locale:
             locale = self._lots_parse_locale
 
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.get(meth, headers={"accept": "*/*"}, locale=locale)
-        else:
-            response = self.client.get(meth, headers={"accept": "*/*"}, locale=locale)
+        response = await self.client.get(meth, headers=ACCEPT_HEADERS, locale=locale, stream=True)
+        try:
+            if response.status_code != 200:
+                # После aread() primp не отдает .text, поэтому исключение создается из прочитанного тела.
+                body = await response.aread()
+                raise exceptions.RequestFailedError(
+                    exceptions.StoredResponse(response.status_code, body.decode(errors="replace")))
 
-        if response.status_code != 200:
-            raise exceptions.RequestFailedError(response)
+            if locale:
+                self.locale = self._default_locale
 
-        if locale:
-            self.locale = self._default_locale
-        html_response = response.text
-
-        from ..common.parser import parse_subcategory_public_lots
-        return parse_subcategory_public_lots(html_response, self, subcategory_type, subcategory_id)
+            parser = SubcategoryPublicLotsParser(self, subcategory_type, subcategory_id)
+            async for chunk in response.aiter_bytes():
+                parser.feed(chunk)
+        finally:
+            await response.aclose()
+        return parser.close()
 
     async def get_my_subcategory_lots(self: Account, subcategory_id: int,
                                 locale: Literal["ru", "en", "uk"] | None = None) -> list[types.MyLotShortcut]:
@@ -62,10 +72,7 @@ class LotsMixin:
         if not locale:
             locale = self._lots_parse_locale
 
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.get(meth, headers={"accept": "*/*"}, locale=locale)
-        else:
-            response = self.client.get(meth, headers={"accept": "*/*"}, locale=locale)
+        response = await self.client.get(meth, headers=ACCEPT_HEADERS, locale=locale)
 
         if response.status_code != 200:
             raise exceptions.RequestFailedError(response)
@@ -74,7 +81,6 @@ class LotsMixin:
             self.locale = self._default_locale
         html_response = response.text
 
-        from ..common.parser import parse_my_subcategory_lots
         return parse_my_subcategory_lots(html_response, self, subcategory_id)
 
     async def get_lot_page(self: Account, lot_id: int, locale: Literal["ru", "en", "uk"] | None = None):
@@ -89,13 +95,7 @@ class LotsMixin:
         """
         if not self.is_initiated:
             raise exceptions.AccountNotInitiatedError()
-        headers = {
-            "accept": "*/*"
-        }
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.get(f"lots/offer?id={lot_id}", headers=headers, locale=locale)
-        else:
-            response = self.client.get(f"lots/offer?id={lot_id}", headers=headers, locale=locale)
+        response = await self.client.get(f"lots/offer?id={lot_id}", headers=ACCEPT_HEADERS, locale=locale)
 
         if response.status_code != 200:
             raise exceptions.RequestFailedError(response)
@@ -104,7 +104,6 @@ class LotsMixin:
             self.locale = self._default_locale
         html_response = response.text
 
-        from ..common.parser import parse_lot_page
         return parse_lot_page(html_response, self, lot_id)
 
     async def get_lot_fields(self: Account, lot_id: int) -> types.LotFields:
@@ -119,41 +118,45 @@ class LotsMixin:
         """
         if not self.is_initiated:
             raise exceptions.AccountNotInitiatedError()
-        headers = {}
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.get(f"lots/offerEdit?offer={lot_id}", headers=headers)
-        else:
-            response = self.client.get(f"lots/offerEdit?offer={lot_id}", headers=headers)
+        response = await self.client.get(f"lots/offerEdit?offer={lot_id}")
 
         if response.status_code != 200:
             raise exceptions.RequestFailedError(response)
 
-        html_response = response.text
-        bs = BeautifulSoup(html_response, "lxml")
-        error_message = bs.find("p", class_="lead")
-        if error_message:
-            raise exceptions.LotParsingError(response, error_message.text, lot_id)
-        result = {}
-        result.update({field["name"]: field.get("value") or "" for field in bs.find_all("input")})
-        result.update({field["name"]: field.text or "" for field in bs.find_all("textarea")})
-        result.update({
-            field["name"]: field.find("option", selected=True)["value"]
-            for field in bs.find_all("select") if
-            "hidden" not in field.find_parent(class_="form-group").get("class", [])
-        })
-        result.update({field["name"]: "on" for field in bs.find_all("input", {"type": "checkbox"}, checked=True)})
+        root = parse_html_bytes(response.content)
+        if error_message := root.xpath(f"//p[{utils.xpath_class('lead')}]"):
+            raise exceptions.LotParsingError(response, error_message[0].text_content(), lot_id)
+        # Поля собираются за один обход документа; порядок приоритета (input < textarea < select < checkbox)
+        # сохраняется за счет отдельных словарей.
+        result, textareas, selects, checkboxes = {}, {}, {}, {}
+        for field in root.iter("input", "textarea", "select"):
+            if (name := field.get("name")) is None:
+                continue
+            if field.tag == "input":
+                result[name] = field.get("value") or ""
+                if field.get("type") == "checkbox" and field.get("checked") is not None:
+                    checkboxes[name] = "on"
+            elif field.tag == "textarea":
+                textareas[name] = field.text_content() or ""
+            else:
+                # select вне .form-group не относится к полям лота - пропускаем.
+                form_group = next((i for i in field.iterancestors() if "form-group" in i.classes), None)
+                if form_group is not None and "hidden" not in form_group.classes:
+                    selects[name] = field.xpath(".//option[@selected]")[0].get("value")
+        result.update(textareas)
+        result.update(selects)
+        result.update(checkboxes)
         subcategory = self.get_subcategory(enums.SubCategoryTypes.COMMON, int(result.get("node_id", 0)))
         self.csrf_token = result.get("csrf_token") or self.csrf_token
-        currency = utils.parse_currency(bs.find("span", class_="form-control-feedback").text)
+        currency = utils.parse_currency(
+            root.xpath(f"//span[{utils.xpath_class('form-control-feedback')}]")[0].text_content())
         if self.currency != currency:
             self.currency = currency
-        bs_buyer_prices = bs.find("table", class_="table-buyers-prices").find_all("tr")
+        buyer_prices = root.xpath(f"//table[{utils.xpath_class('table-buyers-prices')}]")[0].iter("tr")
         payment_methods = []
-        for i, pm in enumerate(bs_buyer_prices):
-            pm_price, pm_currency = pm.find("td").text.rsplit(maxsplit=1)
-            pm_price = float(pm_price.replace(" ", ""))
-            pm_currency = utils.parse_currency(pm_currency)
-            payment_methods.append(types.PaymentMethod(pm.find("th").text, pm_price, pm_currency, i))
+        for i, pm in enumerate(buyer_prices):
+            pm_price, pm_currency = utils.parse_price(pm.find(".//td").text_content())
+            payment_methods.append(types.PaymentMethod(pm.find(".//th").text_content(), pm_price, pm_currency, i))
         calc_result = types.CalcResult(types.SubCategoryTypes.COMMON, subcategory.id, payment_methods,
                                  float(result["price"]), None, types.Currency.UNKNOWN, currency)
         return types.LotFields(lot_id, result, subcategory, currency, calc_result)
@@ -161,17 +164,13 @@ class LotsMixin:
     async def get_chip_fields(self: Account, subcategory_id: int) -> types.ChipFields:
         if not self.is_initiated:
             raise exceptions.AccountNotInitiatedError()
-        headers = {}
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.get(f"chips/{subcategory_id}/trade", headers=headers)
-        else:
-            response = self.client.get(f"chips/{subcategory_id}/trade", headers=headers)
+        response = await self.client.get(f"chips/{subcategory_id}/trade")
 
         if response.status_code != 200:
             raise exceptions.RequestFailedError(response)
 
-        html_response = response.text
-        bs = BeautifulSoup(html_response, "lxml")
+        # Из страницы нужны только поля формы, поэтому дерево BeautifulSoup строится только из тегов <input>.
+        bs = BeautifulSoup(response.content, "lxml", from_encoding="utf-8", parse_only=_INPUTS_STRAINER)
         result = {field["name"]: field.get("value") or "" for field in bs.find_all("input") if field["name"] != "query"}
         result.update({field["name"]: "on" for field in bs.find_all("input", {"type": "checkbox"}, checked=True)})
         return types.ChipFields(self.id, subcategory_id, result)
@@ -185,11 +184,6 @@ class LotsMixin:
         """
         if not self.is_initiated:
             raise exceptions.AccountNotInitiatedError()
-        headers = {
-            "accept": "*/*",
-            "content-type": "application/x-www-form-urlencoded; charset=UTF-8",
-            "x-requested-with": "XMLHttpRequest",
-        }
         offer_fields.csrf_token = self.csrf_token
 
         if isinstance(offer_fields, types.LotFields):
@@ -202,15 +196,30 @@ class LotsMixin:
             fields = offer_fields.renew_fields().fields
             api_method = "chips/saveOffers"
 
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.post(api_method, headers=headers, data=fields)
-        else:
-            response = self.client.post(api_method, headers=headers, data=fields)
+        await self._post_offer(api_method, fields, id_)
+
+    async def _post_offer(self: Account, api_method: str, fields: dict, id_: int):
+        """
+        Отправляет поля лота на FunPay и проверяет ответ на наличие ошибок сохранения.
+
+        :param api_method: метод API (`lots/offerSave` или `chips/saveOffers`).
+        :type api_method: :obj:`str`
+
+        :param fields: поля лота.
+        :type fields: :obj:`dict`
+
+        :param id_: ID лота / подкатегории (для исключения).
+        :type id_: :obj:`int`
+        """
+        response = await self.client.post(api_method, headers=FORM_XHR_HEADERS, data=fields)
 
         if response.status_code != 200:
             raise exceptions.RequestFailedError(response)
 
-        json_response = response.json()
+        content = response.content
+        if b'"error' not in content:  # ни "error", ни "errors" - лот сохранен, JSON можно не разбирать
+            return
+        json_response = utils.json_loads(content)
         errors_dict = {}
         if (errors := json_response.get("errors")) or json_response.get("error"):
             if errors:
@@ -232,7 +241,10 @@ class LotsMixin:
         :param lot_id: ID лота.
         :type lot_id: :obj:`int`
         """
-        await self.save_lot(types.LotFields(lot_id, {"csrf_token": self.csrf_token, "offer_id": lot_id, "deleted": "1"}))
+        if not self.is_initiated:
+            raise exceptions.AccountNotInitiatedError()
+        fields = {"csrf_token": self.csrf_token, "offer_id": str(lot_id), "deleted": "1", "location": "trade"}
+        await self._post_offer("lots/offerSave", fields, lot_id)
 
     async def get_raise_modal(self: Account, category_id: int) -> dict:
         """
@@ -250,24 +262,16 @@ class LotsMixin:
             raise exceptions.AccountNotInitiatedError()
         category = self.get_category(category_id)
         subcategory = category.get_subcategories()[0]
-        headers = {
-            "accept": "*/*",
-            "content-type": "application/x-www-form-urlencoded; charset=UTF-8",
-            "x-requested-with": "XMLHttpRequest"
-        }
         payload = {
             "game_id": category_id,
             "node_id": subcategory.id
         }
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.post("https://funpay.com/lots/raise", headers=headers, data=payload)
-        else:
-            response = self.client.post("https://funpay.com/lots/raise", headers=headers, data=payload)
+        response = await self.client.post("https://funpay.com/lots/raise", headers=FORM_XHR_HEADERS, data=payload)
 
         if response.status_code != 200:
             raise exceptions.RequestFailedError(response)
 
-        json_response = response.json()
+        json_response = utils.json_loads(response.content)
         return json_response
 
     async def raise_lots(self: Account, category_id: int, subcategories: Optional[list[int | types.SubCategory]] = None,
@@ -304,38 +308,54 @@ class LotsMixin:
                     if not (subcat := category.get_subcategory(types.SubCategoryTypes.COMMON, i)):
                         continue
                     subcats.append(subcat)
+            node_ids = [i.id for i in subcats]
         else:
-            subcats = [i for i in category.get_subcategories() if
-                       i.type is types.SubCategoryTypes.COMMON and i.id not in exclude]
+            key = (category_id, tuple(sorted(exclude)))
+            if (node_ids := self._raise_payload_cache.get(key)) is None:
+                node_ids = [i.id for i in category.get_subcategories() if
+                            i.type is types.SubCategoryTypes.COMMON and i.id not in exclude]
+                self._raise_payload_cache[key] = node_ids
 
-        headers = {
-            "accept": "*/*",
-            "content-type": "application/x-www-form-urlencoded; charset=UTF-8",
-            "x-requested-with": "XMLHttpRequest"
-        }
         payload = {
             "game_id": category_id,
-            "node_id": subcats[0].id,
-            "node_ids[]": [i.id for i in subcats]
+            "node_id": node_ids[0],
+            "node_ids[]": node_ids
         }
 
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.post("lots/raise", headers=headers, data=payload)
-        else:
-            response = self.client.post("lots/raise", headers=headers, data=payload)
+        response = await self.client.post("lots/raise", headers=FORM_XHR_HEADERS, data=payload)
 
         if response.status_code != 200:
             raise exceptions.RequestFailedError(response)
 
-        json_response = response.json()
+        json_response = utils.json_loads(response.content)
         logger.debug(f"Ответ FunPay (поднятие категорий): {json_response}.")  # locale
         if not json_response.get("error") and not json_response.get("url"):
             return True
         elif json_response.get("url"):
             raise exceptions.RaiseError(response, category.name, json_response.get("url"), 7200)
-        elif json_response.get("error") and json_response.get("msg") and \
-                any([i in json_response.get("msg") for i in ("Подождите ", "Please wait ", "Зачекайте ")]):
-            wait_time = utils.parse_wait_time(json_response.get("msg"))
-            raise exceptions.RaiseError(response, category.name, json_response.get("msg"), wait_time)
+        elif json_response.get("error") and (msg := json_response.get("msg")) and msg.startswith(_WAIT_PREFIXES):
+            wait_time = utils.parse_wait_time(msg)
+            raise exceptions.RaiseError(response, category.name, msg, wait_time)
         else:
             raise exceptions.RaiseError(response, category.name, json_response.get("msg"), None)
+
+    async def raise_categories(self: Account, category_ids: list[int],
+                               exclude: list[int] | None = None) -> dict[int, bool | Exception]:
+        """
+        Поднимает лоты сразу нескольких категорий (игр). Запросы на поднятие отправляются параллельно.
+
+        :param category_ids: ID категорий (игр), лоты которых необходимо поднять.
+        :type category_ids: :obj:`list` of :obj:`int`
+
+        :param exclude: ID подкатегорий, которые не нужно поднимать.
+        :type exclude: :obj:`list` of :obj:`int`, опционально.
+
+        :return: словарь {ID категории: `True` или исключение, возникшее при поднятии}.
+        :rtype: :obj:`dict` {:obj:`int`: :obj:`bool` or :obj:`Exception`}
+        """
+        if not self.is_initiated:
+            raise exceptions.AccountNotInitiatedError()
+
+        results = await asyncio.gather(*(self.raise_lots(category_id, exclude=exclude) for category_id in category_ids),
+                                       return_exceptions=True)
+        return dict(zip(category_ids, results))
@@ -1,9 +1,10 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, Literal, Optional
+from urllib.parse import urlencode
 
 from funpay_api.common import exceptions, utils
 from .. import types
-from ..client import AsyncClient
+from funpay_api.common.parser import parse_order, SalesParser
 
 if TYPE_CHECKING:
     from funpay_api.async_account import AsyncAccount as Account
@@ -42,19 +43,16 @@ class OrdersMixin:
             "orderId": order_id
         }
 
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.post("orders/review", headers=headers, data=payload)
-        else:
-            response = self.client.post("orders/review", headers=headers, data=payload)
+        response = await self.client.post("orders/review", headers=headers, data=payload)
 
         if response.status_code == 400:
-            json_response = response.json()
+            json_response = utils.json_loads(response.content)
             msg = json_response.get("msg")
             raise exceptions.FeedbackEditingError(response, msg, order_id)
         elif response.status_code != 200:
             raise exceptions.RequestFailedError(response)
 
-        return response.json().get("content")
+        return utils.json_loads(response.content).get("content")
 
     async def delete_review(self: Account, order_id: str) -> str:
         """
@@ -79,19 +77,16 @@ class OrdersMixin:
             "orderId": order_id
         }
 
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.post("orders/reviewDelete", headers=headers, data=payload)
-        else:
-            response = self.client.post("orders/reviewDelete", headers=headers, data=payload)
+        response = await self.client.post("orders/reviewDelete", headers=headers, data=payload)
 
         if response.status_code == 400:
-            json_response = response.json()
+            json_response = utils.json_loads(response.content)
             msg = json_response.get("msg")
             raise exceptions.FeedbackEditingError(response, msg, order_id)
         elif response.status_code != 200:
             raise exceptions.RequestFailedError(response)
 
-        return response.json().get("content")
+        return utils.json_loads(response.content).get("content")
 
     async def refund(self: Account, order_id):
         """
@@ -114,16 +109,14 @@ class OrdersMixin:
             "csrf_token": self.csrf_token
         }
 
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.post("orders/refund", headers=headers, data=payload)
-        else:
-            response = self.client.post("orders/refund", headers=headers, data=payload)
+        response = await self.client.post("orders/refund", headers=headers, data=payload)
 
         if response.status_code != 200:
             raise exceptions.RequestFailedError(response)
 
-        if response.json().get("error"):
-            raise exceptions.RefundError(response, response.json().get("msg"), order_id)
+        json_response = utils.json_loads(response.content)
+        if json_response.get("error"):
+            raise exceptions.RefundError(response, json_response.get("msg"), order_id)
 
     async def get_order_shortcut(self: Account, order_id: str) -> types.OrderShortcut:
         """
@@ -157,10 +150,7 @@ class OrdersMixin:
         if not locale:
             locale = self._order_parse_locale
 
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.get(f"orders/{order_id}/", headers=headers, locale=locale)
-        else:
-            response = self.client.get(f"orders/{order_id}/", headers=headers, locale=locale)
+        response = await self.client.get(f"orders/{order_id}/", headers=headers, locale=locale)
 
         if response.status_code != 200:
             raise exceptions.RequestFailedError(response)
@@ -169,7 +159,6 @@ class OrdersMixin:
             self.locale = self._default_locale
         html_response = response.text
 
-        from funpay_api.common.parser import parse_order
         return parse_order(html_response, self, order_id)
 
     async def get_sales(self: Account, start_from: str | None = None, include_paid: bool = True, include_closed: bool = True,
@@ -239,29 +228,35 @@ class OrdersMixin:
         filters = {name: filters[name] for name in filters if filters[name]}
         filters.update(more_filters)
 
-        link = "https://funpay.com/orders/trade?"
-        for name in filters:
-            link += f"{name}={filters[name]}&"
-        link = link[:-1]
+        link = "https://funpay.com/orders/trade"
+        if filters:
+            link += "?" + urlencode(filters)
 
         if start_from:
             filters["continue"] = start_from
 
         locale = locale or self._profile_parse_locale
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.post(link, data=filters, locale=locale) if start_from else await self.client.get(link, locale=locale)
+        # Страница продаж разбирается по мере загрузки, не держа в памяти весь ответ.
+        if start_from:
+            response = await self.client.post(link, data=filters, locale=locale, stream=True)
         else:
-            response = self.client.post(link, data=filters, locale=locale) if start_from else self.client.get(link, locale=locale)
-
-        if response.status_code != 200:
-            raise exceptions.RequestFailedError(response)
-
-        if not start_from:
-            self.locale = self._default_locale
-        html_response = response.text
-
-        from funpay_api.common.parser import parse_sales
-        return parse_sales(html_response, self, include_paid, include_closed, include_refunded, exclude_ids, start_from)
+            response = await self.client.get(link, locale=locale, stream=True)
+        try:
+            if response.status_code != 200:
+                # После aread() primp не отдает .text, поэтому исключение создается из прочитанного тела.
+                body = await response.aread()
+                raise exceptions.RequestFailedError(
+                    exceptions.StoredResponse(response.status_code, body.decode(errors="replace")))
+
+            if not start_from:
+                self.locale = self._default_locale
+
+            parser = SalesParser(self, include_paid, include_closed, include_refunded, exclude_ids, start_from)
+            async for chunk in response.aiter_bytes():
+                parser.feed(chunk)
+        finally:
+            await response.aclose()
+        return parser.close()
 
     async def get_sells(self: Account, start_from: str | None = None, include_paid: bool = True, include_closed: bool = True,
                   include_refunded: bool = True, exclude_ids: list[str] | None = None,
@@ -1,17 +1,20 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
+import html
+import re
 
 from funpay_api.common import enums, utils, exceptions
 from .. import types
 from ..types import PaymentMethod, CalcResult
-from funpay_api.common.utils import RegularExpressions, parse_currency
-from ..client import AsyncClient, SyncClient
-from bs4 import BeautifulSoup
-import json
+from funpay_api.common.parser import parse_balance
+from funpay_api.common.utils import RegularExpressions, parse_currency, ACCEPT_HEADERS, XHR_HEADERS, FORM_XHR_HEADERS
 
 if TYPE_CHECKING:
     from funpay_api.async_account import AsyncAccount as Account
 
+_LEAD_RE = re.compile(r"""<p\s[^>]*?class=["'](?:[^"']*\s)?lead(?:\s[^"']*)?["'][^>]*>(.*?)</p>""", re.S)
+_TAG_RE = re.compile(r"<[^>]*>")
+
 
 class WalletMixin:
     async def withdraw(self: Account, currency: enums.Currency, wallet: enums.Wallet, amount: int | float, address: str) -> float:
@@ -36,36 +39,19 @@ class WalletMixin:
         if not self.is_initiated:
             raise exceptions.AccountNotInitiatedError()
 
-        wallets = {
-            enums.Wallet.QIWI: "qiwi",
-            enums.Wallet.YOUMONEY: "fps",
-            enums.Wallet.BINANCE: "binance",
-            enums.Wallet.TRC: "usdt_trc",
-            enums.Wallet.CARD_RUB: "card_rub",
-            enums.Wallet.CARD_USD: "card_usd",
-            enums.Wallet.CARD_EUR: "card_eur",
-            enums.Wallet.WEBMONEY: "wmz"
-        }
-        headers = {
-            "accept": "*/*",
-            "x-requested-with": "XMLHttpRequest"
-        }
         payload = {
             "csrf_token": self.csrf_token,
             "currency_id": currency.code,
-            "ext_currency_id": wallets[wallet],
+            "ext_currency_id": wallet.code,
             "wallet": address,
             "amount_int": str(amount)
         }
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.post("withdraw/withdraw", headers=headers, data=payload)
-        else:
-            response = self.client.post("withdraw/withdraw", headers=headers, data=payload)
+        response = await self.client.post("withdraw/withdraw", headers=XHR_HEADERS, data=payload)
 
         if response.status_code != 200:
             raise exceptions.RequestFailedError(response)
 
-        json_response = response.json()
+        json_response = utils.json_loads(response.content)
         if json_response.get("error"):
             error_message = json_response.get("msg")
             raise exceptions.WithdrawError(response, error_message)
@@ -84,17 +70,13 @@ class WalletMixin:
         if not self.is_initiated:
             raise exceptions.AccountNotInitiatedError()
 
-        if isinstance(self.client, AsyncClient):
-            response = await self.client.get(f"lots/offer?id={lot_id}", headers={"accept": "*/*"})
-        else:
-            response = self.client.get(f"lots/offer?id={lot_id}", headers={"accept": "*/*"})
+        response = await self.client.get(f"lots/offer?id={lot_id}", headers=ACCEPT_HEADERS)
 
         if response.status_code != 200:
             raise exceptions.RequestFailedError(response)
 
         html_response = response.text
 
-        from funpay_api.common.parser import parse_balance
         return parse_balance(html_response, self)
 
     async def calc(self: Account, subcategory_type: enums.SubCategoryTypes, subcategory_id: int | None = None,
@@ -113,21 +95,12 @@ class WalletMixin:
 
         assert value is not None
 
-        headers = {
-            "accept": "*/*",
-            "content-type": "application/x-www-form-urlencoded; charset=UTF-8",
-            "x-requested-with": "XMLHttpRequest"
-        }
-
-        if isinstance(self.client, AsyncClient):
-            r = await self.client.post(f"{type_}/calc", headers=headers, data={key: value, "price": price})
-        else:
-            r = self.client.post(f"{type_}/calc", headers=headers, data={key: value, "price": price})
+        r = await self.client.post(f"{type_}/calc", headers=FORM_XHR_HEADERS, data={key: value, "price": price})
 
         if r.status_code != 200:
             raise exceptions.RequestFailedError(r)
 
-        json_resp = r.json()
+        json_resp = utils.json_loads(r.content)
         if (error := json_resp.get("error")):
             raise Exception(f"Произошел бабах, не нашелся ответ: {error}")  # todo
         methods = []
@@ -135,9 +108,7 @@ class WalletMixin:
             methods.append(PaymentMethod(method.get("name"), float(method["price"].replace(" ", "")),
                                          parse_currency(method.get("unit")), method.get("sort")))
         if "minPrice" in json_resp:
-            min_price, min_price_currency = json_resp["minPrice"].rsplit(" ", maxsplit=1)
-            min_price = float(min_price.replace(" ", ""))
-            min_price_currency = parse_currency(min_price_currency)
+            min_price, min_price_currency = utils.parse_price(json_resp["minPrice"])
         else:
             min_price, min_price_currency = None, types.Currency.UNKNOWN
         return CalcResult(subcategory_type, value, methods, price, min_price, min_price_currency,
@@ -154,29 +125,22 @@ class WalletMixin:
         :return: Кортеж, содержащий коэффициент обмена и текущую валюту аккаунта.
         :rtype: :obj:`tuple[float, types.Currency]`
         """
-        if isinstance(self.client, AsyncClient):
-            r = await self.client.post("https://funpay.com/account/switchCurrency",
-                                 headers={"accept": "*/*", "content-type": "application/x-www-form-urlencoded; charset=UTF-8",
-                                          "x-requested-with": "XMLHttpRequest"},
-                                 data={"cy": currency.code, "csrf_token": self.csrf_token, "confirmed": "false"})
-        else:
-            r = self.client.post("https://funpay.com/account/switchCurrency",
-                                 headers={"accept": "*/*", "content-type": "application/x-www-form-urlencoded; charset=UTF-8",
-                                          "x-requested-with": "XMLHttpRequest"},
-                                 data={"cy": currency.code, "csrf_token": self.csrf_token, "confirmed": "false"})
+        r = await self.client.post("https://funpay.com/account/switchCurrency",
+                                   headers=FORM_XHR_HEADERS,
+                                   data={"cy": currency.code, "csrf_token": self.csrf_token, "confirmed": "false"})
         if r.status_code != 200:
             raise exceptions.RequestFailedError(r)
 
-        b = json.loads(r.text)
+        b = utils.json_loads(r.content)
         if "url" in b and not b["url"]:
             self.currency = currency
             return 1, currency
         else:
-            lead_element = BeautifulSoup(b["modal"], "lxml").find("p", class_="lead")
-            if lead_element is None:
+            lead_match = _LEAD_RE.search(b["modal"])
+            if not lead_match:
                 raise exceptions.RequestFailedError("Unable to find exchange rate element")
-            s = lead_element.text.replace("\xa0", " ")
-            match = RegularExpressions().EXCHANGE_RATE.fullmatch(s)
+            s = html.unescape(_TAG_RE.sub("", lead_match.group(1))).replace("\xa0", " ")
+            match = RegularExpressions.EXCHANGE_RATE.fullmatch(s)
             assert match is not None
             swipe_to = match.group(2)
             assert swipe_to.lower() == currency.code
@@ -8,22 +8,17 @@ from .types import PaymentMethod, CalcResult
 if TYPE_CHECKING:
     from .updater.runner import Runner
 
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-from loguru import logger
 import random
 import string
 import json
 import time
-import re
 
 from . import types
 from .common import exceptions, utils, enums
+from .common.parser import parse_account_data
 from .client import SyncClient, AsyncClient
 
-PRIVATE_CHAT_ID_RE = re.compile(r"users-\d+-\d+$")
-
-
 from funpay_api.account_mixins.account import AccountMixin
 from funpay_api.account_mixins.categories import CategoriesMixin
 from funpay_api.account_mixins.chat import ChatMixin
@@ -115,12 +110,17 @@ class AsyncAccount(LotsMixin, ChatMixin, OrdersMixin, CategoriesMixin, WalletMix
         self._initiated: bool = False
 
         self._saved_chats: dict[int, types.ChatShortcut] = {}
+        self._saved_chats_by_name: dict[str, types.ChatShortcut] = {}
+        self._histories_cache: dict[int | str, tuple[tuple, list[types.Message]]] = {}
+        """Последние разобранные истории чатов {ID чата: ((собеседник, имя, дайджест сообщений), сообщения)}."""
         self.runner: Runner | None = None
         """Объект Runner'а."""
         self._logout_link: str | None = None
         """Ссылка для выхода с аккаунта"""
         self._categories: list[types.Category] = []
         self._sorted_categories: dict[int, types.Category] = {}
+        self._raise_payload_cache: dict[tuple[int, tuple[int, ...]], list[int]] = {}
+        self._sales_subcategories_cache: tuple[tuple, dict[str, types.SubCategory]] | None = None
 
         self._subcategories: list[types.SubCategory] = []
         self._sorted_subcategories: dict[types.SubCategoryTypes, dict[int, types.SubCategory]] = {
@@ -157,9 +157,7 @@ class AsyncAccount(LotsMixin, ChatMixin, OrdersMixin, CategoriesMixin, WalletMix
 
         html_response = response.text
 
-        from .common.parser import parse_account_data
         parse_account_data(html_response, self)
-        self._setup_categories(html_response)
 
         cookies = response.cookies
         if update_phpsessid or not self.phpsessid:
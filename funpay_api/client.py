@@ -1,7 +1,11 @@
 from __future__ import annotations
-from typing import Literal, Any, Optional, cast, TYPE_CHECKING
+from typing import Literal, Any, Optional, TYPE_CHECKING
+from collections import OrderedDict
+from functools import lru_cache
+from abc import ABC, abstractmethod
+import asyncio
+import time
 import primp
-from loguru import logger
 
 if TYPE_CHECKING:
     # Type alias for impersonate values for type checking
@@ -30,69 +34,322 @@ if TYPE_CHECKING:
 else:
     ImpersonateType = str
 
-class _BaseClient:
+_FUNPAY_PREFIX = "https://funpay.com/"
+_LOCALE_SEGMENTS = ("en/", "uk/")
+_LOCALE_PREFIXES = {"en": "https://funpay.com/en/", "uk": "https://funpay.com/uk/"}
+
+
+@lru_cache(maxsize=256)
+def _normalize_url(api_method: str, locale: str | None) -> str:
+    """
+    Приводит адрес запроса к полной ссылке на FunPay с префиксом переданной локали.
+    Запросы в основном идут на небольшой набор одних и тех же адресов, поэтому результат кэшируется.
+    """
+    if api_method.startswith(_FUNPAY_PREFIX):
+        # Уже нормализованная ссылка без префикса локали - самый частый случай.
+        if locale not in _LOCALE_PREFIXES and not api_method.startswith(_LOCALE_SEGMENTS, len(_FUNPAY_PREFIX)):
+            return api_method
+        url = api_method
+    else:
+        url = _FUNPAY_PREFIX if api_method == "https://funpay.com" else _FUNPAY_PREFIX + api_method
+    if url.startswith(_LOCALE_SEGMENTS, len(_FUNPAY_PREFIX)):
+        url = _FUNPAY_PREFIX + url[len(_FUNPAY_PREFIX) + 3:]
+    if (prefix := _LOCALE_PREFIXES.get(locale)) is not None:
+        return prefix + url[len(_FUNPAY_PREFIX):]
+    return url
+
+
+class _BaseClient(ABC):
     def __init__(self, golden_key: str, user_agent: str | None = None,
                  requests_timeout: int | float = 10, proxy: str | None = None,
-                 locale: Literal["ru", "en", "uk"] | None = None, impersonate: ImpersonateType | None = "chrome_124"):
-        self.golden_key = golden_key
-        self.user_agent = user_agent
+                 locale: Literal["ru", "en", "uk"] | None = None, impersonate: ImpersonateType | None = "chrome_124",
+                 cache_ttl: float = 0, cache_max_size: int = 256, pool: dict[tuple, Any] | None = None,
+                 **client_options: Any):
+        self._golden_key = golden_key
+        self._phpsessid: str | None = None
+        self._user_agent = user_agent
+        self._base_headers = self._build_base_headers()
         self.requests_timeout = requests_timeout
         self.proxy = proxy
         self.locale = locale
         self.impersonate = impersonate
-        self.phpsessid: str | None = None
+        # Доп. параметры primp-клиента (http2_only, connect_timeout, dns_resolver и т.д.).
+        # Клиент создается один раз, поэтому пул соединений переиспользуется всеми запросами.
+        self.client_options = client_options
         self.csrf_token: str | None = None
+        self.cache_ttl = cache_ttl
+        """Время жизни закэшированных ответов GET-запросов с use_cache=True (в секундах, 0 - кэш выключен)."""
+        self.cache_max_size = cache_max_size
+        """Максимальное кол-во закэшированных ответов."""
+        self._responses_cache: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self.pool = pool
+        """
+        Общий словарь primp-клиентов {(тип клиента, golden_key, прокси, impersonate, таймаут, доп. параметры): клиент}
+        для переиспользования соединений между экземплярами с одинаковыми настройками (None - свой клиент).
+        Словарь принадлежит вызывающему коду: клиенты в нем живут, пока он их не удалит (или не вызовет close()).
+        """
+        self._primp_client: Any = None
+        self._pool_key: tuple | None = None
 
-    def _prepare_headers(self, headers: dict | None = None) -> dict:
-        if headers is None:
-            headers = {}
-        headers["cookie"] = f"golden_key={self.golden_key}; cookie_prefs=1"
-        if self.phpsessid:
-            headers["cookie"] += f"; PHPSESSID={self.phpsessid}"
-        if self.user_agent:
-            headers["user-agent"] = self.user_agent
+    @property
+    def golden_key(self) -> str:
+        return self._golden_key
+
+    @golden_key.setter
+    def golden_key(self, value: str):
+        self._golden_key = value
+        self._base_headers = self._build_base_headers()
+
+    @property
+    def phpsessid(self) -> str | None:
+        return self._phpsessid
+
+    @phpsessid.setter
+    def phpsessid(self, value: str | None):
+        self._phpsessid = value
+        self._base_headers = self._build_base_headers()
+
+    @property
+    def user_agent(self) -> str | None:
+        return self._user_agent
+
+    @user_agent.setter
+    def user_agent(self, value: str | None):
+        self._user_agent = value
+        self._base_headers = self._build_base_headers()
+
+    def _build_base_headers(self) -> dict[str, str]:
+        # Общие заголовки меняются только вместе с golden_key / PHPSESSID / user-agent, поэтому собираются заранее.
+        cookie = f"golden_key={self._golden_key}; cookie_prefs=1"
+        if self._phpsessid:
+            cookie += f"; PHPSESSID={self._phpsessid}"
+        headers = {"cookie": cookie}
+        if self._user_agent:
+            headers["user-agent"] = self._user_agent
         return headers
 
+    @property
+    def _client(self):
+        """
+        primp-клиент. Создается при первом запросе, поэтому экземпляры без запросов не открывают соединений.
+
+        Из-за этого неверные **client_options или прокси проверяются primp'ом только при первом запросе:
+        ошибка (обычно TypeError / ValueError) будет выброшена из первого вызова get() / post(),
+        а не из конструктора. Для ранней проверки достаточно обратиться к _client сразу после создания.
+        """
+        if self._primp_client is None:
+            self._primp_client = self._get_primp_client(self._new_primp_client)
+            # Связанные методы сохраняются в экземпляре, чтобы не искать их на каждом запросе.
+            self._get, self._post = self._primp_client.get, self._primp_client.post
+        return self._primp_client
+
+    @abstractmethod
+    def _new_primp_client(self):
+        """Создает новый primp-клиент (primp.Client / primp.AsyncClient) для текущих настроек."""
+
+    def _get(self, *args, **kwargs):
+        # Вызывается только до создания клиента, затем перекрывается методом primp-клиента.
+        return self._client.get(*args, **kwargs)
+
+    def _post(self, *args, **kwargs):
+        return self._client.post(*args, **kwargs)
+
+    def _get_primp_client(self, factory):
+        """
+        Возвращает primp-клиент для текущих настроек: из self.pool, если он передан, иначе новый.
+        Ключ содержит golden_key, чтобы cookie, сохраненные клиентом, не смешивались между разными аккаунтами.
+        """
+        if self.pool is None:
+            return factory()
+        try:
+            key = (type(self), self.golden_key, self.proxy, self.impersonate, self.requests_timeout,
+                   frozenset(self.client_options.items()))
+            client = self.pool.get(key)
+        except TypeError:  # в настройках есть нехешируемые значения (напр. dict с прокси) - без пула.
+            return factory()
+        if client is None:
+            client = self.pool[key] = factory()
+        self._pool_key = key
+        return client
+
+    def close(self) -> None:
+        """
+        Освобождает primp-клиент (и удаляет его из self.pool). Следующий запрос создаст новый клиент.
+        """
+        if self._pool_key is not None and self.pool is not None \
+                and self.pool.get(self._pool_key) is self._primp_client:
+            del self.pool[self._pool_key]
+        self._pool_key = None
+        self._primp_client = None
+        # Убираем связанные методы старого клиента, чтобы запросы снова шли через _client.
+        self.__dict__.pop("_get", None)
+        self.__dict__.pop("_post", None)
+
+    @staticmethod
+    def _request_key(url: str, headers: dict, kwargs: dict) -> tuple | None:
+        """
+        Возвращает ключ запроса для кэша / объединения запросов (или None, если параметры запроса нехешируемые).
+        """
+        try:
+            return url, frozenset(headers.items()), frozenset(kwargs.items())
+        except TypeError:
+            return None
+
+    def _get_cached(self, key: tuple):
+        if self.cache_ttl <= 0 or (cached := self._responses_cache.get(key)) is None:
+            return None
+        timestamp, response = cached
+        if time.monotonic() - timestamp >= self.cache_ttl:
+            del self._responses_cache[key]
+            return None
+        self._responses_cache.move_to_end(key)
+        return response
+
+    def _store_cached(self, key: tuple, response):
+        if self.cache_ttl <= 0 or response.status_code != 200:
+            return
+        self._responses_cache[key] = (time.monotonic(), response)
+        self._responses_cache.move_to_end(key)
+        while len(self._responses_cache) > self.cache_max_size:
+            self._responses_cache.popitem(last=False)
+
+    def _prepare_headers(self, headers: dict | None = None) -> dict:
+        # Без доп. заголовков отдается общий словарь (только для передачи в primp, изменять его нельзя).
+        if not headers:
+            return self._base_headers
+        return {**headers, **self._base_headers}
+
     def _normalize_url(self, api_method: str, locale: Literal["ru", "en", "uk"] | None = None) -> str:
-        api_method = "https://funpay.com/" if api_method == "https://funpay.com" else api_method
-        url = api_method if api_method.startswith("https://funpay.com/") else "https://funpay.com/" + api_method
-        locales = ("en", "uk")
-        for loc in locales:
-            url = url.replace(f"https://funpay.com/{loc}/", "https://funpay.com/", 1)
-        if not locale:
-            locale = cast(Literal["ru", "en", "uk"] | None, self.locale)
-        if locale in locales:
-            return url.replace(f"https://funpay.com/", f"https://funpay.com/{locale}/", 1)
-        return url
+        return _normalize_url(api_method, locale or self.locale)
+
+    def _prepare_request(self, url: str, kwargs: dict) -> tuple[str, dict]:
+        """
+        Общая подготовка запроса для get / post: нормализует ссылку и собирает заголовки.
+        Извлекает из kwargs параметры locale и headers, остальные параметры передаются primp без изменений.
+        """
+        return self._normalize_url(url, kwargs.pop('locale', None)), self._prepare_headers(kwargs.pop('headers', None))
 
 class SyncClient(_BaseClient):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # Cast to Any to avoid type conflict with primp's internal IMPERSONATE type
-        self._client = primp.Client(impersonate=cast(Any, self.impersonate), proxy=self.proxy, timeout=self.requests_timeout)
+    def _new_primp_client(self):
+        # Ignore the type conflict with primp's internal IMPERSONATE type instead of a runtime cast()
+        return primp.Client(impersonate=self.impersonate, proxy=self.proxy,  # type: ignore[arg-type]
+                            timeout=self.requests_timeout, **self.client_options)
 
-    def get(self, url: str, **kwargs):
-        url = self._normalize_url(url)
-        headers = self._prepare_headers(kwargs.pop('headers', None))
-        return self._client.get(url, headers=headers, **kwargs)
+    def get(self, url: str, use_cache: bool = False, **kwargs):
+        url, headers = self._prepare_request(url, kwargs)
+        if not use_cache or (key := self._request_key(url, headers, kwargs)) is None:
+            return self._get(url, headers=headers, **kwargs)
+        if (response := self._get_cached(key)) is not None:
+            return response
+        response = self._get(url, headers=headers, **kwargs)
+        self._store_cached(key, response)
+        return response
 
     def post(self, url: str, **kwargs):
-        url = self._normalize_url(url)
-        headers = self._prepare_headers(kwargs.pop('headers', None))
-        return self._client.post(url, headers=headers, **kwargs)
+        url, headers = self._prepare_request(url, kwargs)
+        return self._post(url, headers=headers, **kwargs)
+
+    async def aget(self, url: str, use_cache: bool = False, **kwargs):
+        """
+        Выполняет GET-запрос в отдельном потоке, не блокируя event loop.
+        Используется стандартный executor текущего loop'а (его размер задается через loop.set_default_executor()).
+        """
+        return await asyncio.to_thread(self.get, url, use_cache, **kwargs)
+
+    async def apost(self, url: str, **kwargs):
+        """
+        Выполняет POST-запрос в отдельном потоке, не блокируя event loop.
+        """
+        return await asyncio.to_thread(self.post, url, **kwargs)
 
 class AsyncClient(_BaseClient):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Cast to Any to avoid type conflict with primp's internal IMPERSONATE type
-        self._client = primp.AsyncClient(impersonate=cast(Any, self.impersonate), proxy=self.proxy, timeout=self.requests_timeout)
+        self._inflight: dict[tuple, asyncio.Task] = {}
+        """Выполняющиеся GET-запросы с coalesce=True {(ссылка, заголовки, параметры): задача запроса}."""
+
+    def _new_primp_client(self):
+        # Ignore the type conflict with primp's internal IMPERSONATE type instead of a runtime cast()
+        return primp.AsyncClient(impersonate=self.impersonate, proxy=self.proxy,  # type: ignore[arg-type]
+                                 timeout=self.requests_timeout, **self.client_options)
+
+    async def get(self, url: str, coalesce: bool = False, use_cache: bool = False, **kwargs):
+        """
+        Выполняет GET-запрос.
+
+        :param url: ссылка (или API-метод).
+        :param coalesce: если True и такой же запрос уже выполняется, дождаться его ответа вместо нового запроса
+            (только для идемпотентных запросов; все ожидающие получают один и тот же объект ответа).
+        :param use_cache: вернуть закэшированный ответ на такой же запрос, если он не старше cache_ttl
+            (и закэшировать новый ответ).
+        """
+        url, headers = self._prepare_request(url, kwargs)
+        # Нехешируемые параметры (напр. dict в params) - обычный запрос без кэша и объединения.
+        if not (coalesce or use_cache) or (key := self._request_key(url, headers, kwargs)) is None:
+            return await self._get(url, headers=headers, **kwargs)
+        if use_cache and (response := self._get_cached(key)) is not None:
+            return response
+
+        if not coalesce:
+            response = await self._get(url, headers=headers, **kwargs)
+        else:
+            if (task := self._inflight.get(key)) is None:
+                task = self._start_coalesced_get(key, url, headers, kwargs)
+            # Общий запрос выполняется отдельной задачей, а все ожидающие (в т.ч. инициатор) ждут его через shield:
+            # отмена одного из них только отсоединяет его и не затрагивает остальных.
+            response = await asyncio.shield(task)
+        if use_cache:
+            self._store_cached(key, response)
+        return response
+
+    def _start_coalesced_get(self, key: tuple, url: str, headers: dict, kwargs: dict) -> asyncio.Task:
+        loop = asyncio.get_running_loop()
+        task = self._inflight[key] = loop.create_task(self._get(url, headers=headers, **kwargs))
 
-    async def get(self, url: str, **kwargs):
-        url = self._normalize_url(url)
-        headers = self._prepare_headers(kwargs.pop('headers', None))
-        return await self._client.get(url, headers=headers, **kwargs)
+        def forget(t: asyncio.Task):
+            if self._inflight.get(key) is t:
+                del self._inflight[key]
+            if not t.cancelled():
+                t.exception()  # помечаем исключение полученным, даже если все ожидающие уже отменены.
+
+        task.add_done_callback(forget)
+        return task
 
     async def post(self, url: str, **kwargs):
-        url = self._normalize_url(url)
-        headers = self._prepare_headers(kwargs.pop('headers', None))
-        return await self._client.post(url, headers=headers, **kwargs)
+        url, headers = self._prepare_request(url, kwargs)
+        return await self._post(url, headers=headers, **kwargs)
+
+    async def get_many(self, urls: list[str], *, max_concurrency: int = 16, **kwargs) -> list:
+        """
+        Выполняет несколько GET-запросов параллельно через общий пул соединений.
+
+        :param urls: ссылки (или API-методы) для запросов.
+        :param max_concurrency: максимальное кол-во одновременных запросов.
+        :param kwargs: общие параметры для всех запросов (headers, locale и т.д.).
+
+        :return: ответы в порядке переданных ссылок.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def request(url: str):
+            async with semaphore:
+                return await self.get(url, **kwargs)
+
+        return await asyncio.gather(*(request(url) for url in urls))
+
+    async def post_many(self, requests: list[tuple[str, dict]], *, max_concurrency: int = 16) -> list:
+        """
+        Выполняет несколько POST-запросов параллельно через общий пул соединений.
+
+        :param requests: пары (ссылка или API-метод, параметры запроса (data, headers, locale и т.д.)).
+        :param max_concurrency: максимальное кол-во одновременных запросов.
+
+        :return: ответы в порядке переданных запросов.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def request(url: str, params: dict):
+            async with semaphore:
+                return await self.post(url, **params)
+
+        return await asyncio.gather(*(request(url, params) for url, params in requests))
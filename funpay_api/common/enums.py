@@ -160,3 +160,20 @@ class Wallet(Enum):
     """WebMoney WMZ."""
     YOUMONEY = 7
     """ЮMoney."""
+
+    @property
+    def code(self) -> str:
+        """Код кошелька, используемый FunPay при выводе средств."""
+        return _WALLET_CODES[self]
+
+
+_WALLET_CODES = {
+    Wallet.QIWI: "qiwi",
+    Wallet.YOUMONEY: "fps",
+    Wallet.BINANCE: "binance",
+    Wallet.TRC: "usdt_trc",
+    Wallet.CARD_RUB: "card_rub",
+    Wallet.CARD_USD: "card_usd",
+    Wallet.CARD_EUR: "card_eur",
+    Wallet.WEBMONEY: "wmz"
+}
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 
 if TYPE_CHECKING:
     from primp.response import Response
@@ -16,80 +16,145 @@ class AccountNotInitiatedError(funpay_apiError):
         super().__init__("The account has not been initiated with .get() before calling this method.")
 
 
-class RequestFailedError(funpay_apiError):
+class StoredResponse(NamedTuple):
+    """
+    Status code and body of a response that can no longer be read (e.g. an already consumed stream).
+    Also used to restore response errors after unpickling.
+    """
+    status_code: int
+    text: str | None
+
+
+def _restore_response_error(cls: type[_ResponseError], status_code: int, response_text: str | None, args: tuple):
+    return cls(StoredResponse(status_code, response_text), *args)
+
+
+class _ResponseError(funpay_apiError):
+    """
+    Base class for exceptions caused by a FunPay response.
+
+    Attributes:
+        response: the response that caused the error (None if the exception was created with drop_response=True).
+        status_code: HTTP status code of the response.
+        response_text: the first 1024 characters of the response body (or None).
+
+    Pass drop_response=True to keep only status_code and response_text, so the response (and its body)
+    can be freed while the exception is alive, e.g. when many errors are collected in a loop.
+    """
+    __slots__ = ("status_code", "response_text", "response")
+    def __init__(self, response: Response, drop_response: bool, *args):
+        self.status_code: int = response.status_code
+        text = getattr(response, "text", None)
+        self.response_text: str | None = text[:1024] if text is not None else None
+        self.response: Response | None = None if drop_response else response
+        super().__init__(*args)
+
+    def __reduce__(self):
+        # args holds the subclass fields in constructor order; the response is replaced with a StoredResponse.
+        return _restore_response_error, (type(self), self.status_code, self.response_text, self.args)
+
+
+class RequestFailedError(_ResponseError):
     """Raised when a request to FunPay fails."""
-    def __init__(self, response: Response):
-        self.response = response
-        super().__init__(f"Request to FunPay failed with status code {response.status_code}.")
+    __slots__ = ()
+    def __init__(self, response: Response, drop_response: bool = False):
+        super().__init__(response, drop_response)
 
+    def __str__(self):
+        return f"Request to FunPay failed with status code {self.status_code}."
 
-class ImageUploadError(funpay_apiError):
+
+class ImageUploadError(_ResponseError):
     """Raised when an image upload fails."""
-    def __init__(self, response: Response, message: str | None):
-        self.response = response
+    __slots__ = ("message",)
+    def __init__(self, response: Response, message: str | None, drop_response: bool = False):
         self.message = message
-        super().__init__(f"Image upload failed. Message: {message}")
+        super().__init__(response, drop_response, message)
+
+    def __str__(self):
+        return f"Image upload failed. Message: {self.message}"
 
 
-class MessageNotDeliveredError(funpay_apiError):
+class MessageNotDeliveredError(_ResponseError):
     """Raised when a message is not delivered."""
-    def __init__(self, response: Response, message: str | None, chat_id: int | str):
-        self.response = response
+    __slots__ = ("message", "chat_id")
+    def __init__(self, response: Response, message: str | None, chat_id: int | str, drop_response: bool = False):
         self.message = message
         self.chat_id = chat_id
-        super().__init__(f"Message to chat {chat_id} not delivered. Reason: {message}")
+        super().__init__(response, drop_response, message, chat_id)
+
+    def __str__(self):
+        return f"Message to chat {self.chat_id} not delivered. Reason: {self.message}"
 
 
-class FeedbackEditingError(funpay_apiError):
+class FeedbackEditingError(_ResponseError):
     """Raised when there is an error editing feedback."""
-    def __init__(self, response: Response, message: str | None, order_id: str):
-        self.response = response
+    __slots__ = ("message", "order_id")
+    def __init__(self, response: Response, message: str | None, order_id: str, drop_response: bool = False):
         self.message = message
         self.order_id = order_id
-        super().__init__(f"Error editing feedback for order {order_id}. Reason: {message}")
+        super().__init__(response, drop_response, message, order_id)
 
+    def __str__(self):
+        return f"Error editing feedback for order {self.order_id}. Reason: {self.message}"
 
-class RefundError(funpay_apiError):
+
+class RefundError(_ResponseError):
     """Raised when a refund fails."""
-    def __init__(self, response: Response, message: str | None, order_id: str):
-        self.response = response
+    __slots__ = ("message", "order_id")
+    def __init__(self, response: Response, message: str | None, order_id: str, drop_response: bool = False):
         self.message = message
         self.order_id = order_id
-        super().__init__(f"Refund for order {order_id} failed. Reason: {message}")
+        super().__init__(response, drop_response, message, order_id)
+
+    def __str__(self):
+        return f"Refund for order {self.order_id} failed. Reason: {self.message}"
 
 
-class WithdrawError(funpay_apiError):
+class WithdrawError(_ResponseError):
     """Raised when a withdrawal fails."""
-    def __init__(self, response: Response, message: str | None):
-        self.response = response
+    __slots__ = ("message",)
+    def __init__(self, response: Response, message: str | None, drop_response: bool = False):
         self.message = message
-        super().__init__(f"Withdrawal failed. Reason: {message}")
+        super().__init__(response, drop_response, message)
 
+    def __str__(self):
+        return f"Withdrawal failed. Reason: {self.message}"
 
-class RaiseError(funpay_apiError):
+
+class RaiseError(_ResponseError):
     """Raised when raising lots fails."""
-    def __init__(self, response: Response, category_name: str, message: str | None, wait_time: int | None):
-        self.response = response
+    __slots__ = ("category_name", "message", "wait_time")
+    def __init__(self, response: Response, category_name: str, message: str | None, wait_time: int | None, drop_response: bool = False):
         self.category_name = category_name
         self.message = message
         self.wait_time = wait_time
-        super().__init__(f"Failed to raise lots for category {category_name}. Reason: {message}")
+        super().__init__(response, drop_response, category_name, message, wait_time)
+
+    def __str__(self):
+        return f"Failed to raise lots for category {self.category_name}. Reason: {self.message}"
 
 
-class LotParsingError(funpay_apiError):
+class LotParsingError(_ResponseError):
     """Raised when parsing a lot fails."""
-    def __init__(self, response: Response, message: str | None, lot_id: int):
-        self.response = response
+    __slots__ = ("message", "lot_id")
+    def __init__(self, response: Response, message: str | None, lot_id: int, drop_response: bool = False):
         self.message = message
         self.lot_id = lot_id
-        super().__init__(f"Failed to parse lot {lot_id}. Reason: {message}")
+        super().__init__(response, drop_response, message, lot_id)
 
+    def __str__(self):
+        return f"Failed to parse lot {self.lot_id}. Reason: {self.message}"
 
-class LotSavingError(funpay_apiError):
+
+class LotSavingError(_ResponseError):
     """Raised when saving a lot fails."""
-    def __init__(self, response: Response, message: str | None, lot_id: int, errors: dict[str, str]):
-        self.response = response
+    __slots__ = ("message", "lot_id", "errors")
+    def __init__(self, response: Response, message: str | None, lot_id: int, errors: dict[str, str], drop_response: bool = False):
         self.message = message
         self.lot_id = lot_id
         self.errors = errors
-        super().__init__(f"Failed to save lot {lot_id}. Reason: {message}, Errors: {errors}")
+        super().__init__(response, drop_response, message, lot_id, errors)
+
+    def __str__(self):
+        return f"Failed to save lot {self.lot_id}. Reason: {self.message}, Errors: {self.errors}"
@@ -1,19 +1,226 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
-from bs4 import BeautifulSoup
+from typing import TYPE_CHECKING, Iterator
+from lxml import etree, html as lxml_html
 from loguru import logger
-import json
+import re
+import copy
+import hashlib
+import threading
 from . import enums, utils, exceptions
 from .. import types
 from datetime import datetime, timedelta
+from functools import partial
 
 if TYPE_CHECKING:
     from ..account import Account
 
+_TEXT = etree.XPath("string()", smart_strings=False)
+_THREAD_LOCAL = threading.local()
+_NON_DIGITS_RE = re.compile(r"\D+")
 
-def _update_csrf_token(parser: BeautifulSoup, account: Account):
+
+def _class_xpath(tag: str, class_name: str, function: str | None = None) -> etree.XPath:
+    """
+    Возвращает скомпилированное XPath-выражение для поиска потомков с переданным тегом и классом
+    (или несколькими классами через пробел).
+    Если передана XPath-функция (`count`, `boolean`, `string`), выражение возвращает ее результат,
+    а не список элементов.
+    """
+    expr = f".//{tag}[{' and '.join(utils.xpath_class(i) for i in class_name.split())}]"
+    return etree.XPath(f"{function}({expr})" if function else expr, smart_strings=False)
+
+
+def _first(elements: list):
+    """
+    Возвращает первый элемент из результата XPath-выражения (или :obj:`None`).
+    """
+    return elements[0] if elements else None
+
+
+def _parse_amount(element) -> int | None:
+    """
+    Возвращает количество товара из блока tc-amount (или :obj:`None`, если блока нет или в нем не число).
+    """
+    return utils.parse_amount(_TEXT(element)) if element is not None else None
+
+
+def _find_first_by_classes(element, class_tags: dict[str, str]) -> dict:
+    """
+    За один обход потомков элемента находит первый (в порядке документа) потомок для каждого из классов.
+    Заменяет несколько отдельных XPath-поисков `.//tag[class]` по одному и тому же поддереву.
+
+    :param element: элемент, среди потомков которого производится поиск.
+    :param class_tags: классы и теги, которые должны быть у найденных элементов {класс: тег}.
+
+    :return: найденные элементы {класс: элемент}.
+    """
+    found = {}
+    for el in element.iterdescendants(etree.Element):
+        if not (class_name := el.get("class")):
+            continue
+        for i in class_name.split():
+            if class_tags.get(i) == el.tag and i not in found:
+                found[i] = el
+    return found
+
+
+def _outer_html(element) -> str:
+    """
+    Возвращает HTML-код элемента (без хвостового текста).
+    """
+    return etree.tostring(element, encoding="unicode", method="html", with_tail=False)
+
+
+_ACTIVE_ITEM = _class_xpath("li", "active")
+_ATTACHMENTS_THUMBS = _class_xpath("a", "attachments-thumb")
+_HAS_AUTO_DLV_ICON = _class_xpath("i", "auto-dlv-icon", "boolean")
+_AVATAR_PHOTO = _class_xpath("div", "avatar-photo")
+_BACK_LINK = _class_xpath("a", "js-back-link")
+_BADGE_BALANCE = _class_xpath("span", "badge badge-balance")
+_BADGE_ORDERS = _class_xpath("span", "badge badge-orders")
+_BADGE_TRADE = _class_xpath("span", "badge badge-trade")
+_CHAT_HEADER = _class_xpath("div", "chat-header")
+_CHAT_IMG_LINK = _class_xpath("a", "chat-img-link")
+_CHAT_MSG_TEXT_STR = _class_xpath("div", "chat-msg-text", "string")
+_CHAT_PANEL = _class_xpath("div", "param-item chat-panel")
+_CONTACT_ITEMS = _class_xpath("a", "contact-item")
+_CONTACT_ITEM_MESSAGE = _class_xpath("div", "contact-item-message")
+_HAS_DANGER_LABEL = _class_xpath("span", "label label-danger", "boolean")
+_COUNT_FAS_STARS = _class_xpath("i", "fas", "count")
+_DEFAULT_LABEL = _class_xpath("span", "chat-msg-author-label label label-default")
+_LOGOUT_LINK = _class_xpath("a", "menu-item-logout")
+_MEDIA_BODY = _class_xpath("div", "media-body")
+_MEDIA_USER_NAME = _class_xpath("div", "media-user-name")
+_MEDIA_USER_REVIEWS = _class_xpath("div", "media-user-reviews")
+_MEDIA_USER_STATUS = _class_xpath("span", "media-user-status")
+_NAV_BAR = _class_xpath("ul", "nav navbar-nav navbar-right logged")
+_OFFER_LIST_TITLES = _class_xpath("div", "offer-list-title-container")
+_ORDER_REVIEW = _class_xpath("div", "order-review")
+_PAGE_HEADER = _class_xpath("h1", "page-header")
+_PARAM_ITEMS = _class_xpath("div", "param-item")
+_PROFILE_USERNAME = _class_xpath("span", "mr4")
+_RATING = _class_xpath("div", "rating")
+_RATING_STARS = _class_xpath("div", "rating-stars")
+_REVIEW_REPLY = _class_xpath("div", "review-item-answer review-compiled-reply")
+_REVIEW_TEXT = _class_xpath("div", "review-item-text")
+_SECRET_PLACEHOLDERS = _class_xpath("span", "secret-placeholder")
+_SUCCESS_LABEL = _class_xpath("span", "chat-msg-author-label label label-success")
+_TC_AMOUNT = _class_xpath("div", "tc-amount")
+_TC_DESC_TEXT = _class_xpath("div", "tc-desc-text")
+_TC_ITEMS = _class_xpath("a", "tc-item")
+_TC_PRICE = _class_xpath("div", "tc-price")
+_TC_SERVER = _class_xpath("div", "tc-server")
+_TEXT_BOLD = _class_xpath("div", "text-bold")
+_TEXT_SUCCESS = _class_xpath("span", "text-success")
+_TEXT_WARNING = _class_xpath("span", "text-warning")
+_HAS_TEXT_WARNING = _class_xpath("span", "text-warning", "boolean")
+_UNIT_TEXT = _class_xpath("span", "unit", "string")
+_USER_LINK_NAME = _class_xpath("div", "user-link-name")
+_ALERT = etree.XPath(".//div[@role='alert']")
+_DIV_TEXT = etree.XPath("string(.//div)", smart_strings=False)
+_OFFER_LIST_TITLE_HREF = etree.XPath("string((.//h3)[1]//a/@href)", smart_strings=False)
+_USER_LINKS = etree.XPath(".//a[contains(@href, '/users/')]")
+_HAS_PRECEDING_HR = etree.XPath("boolean(preceding::hr)")
+_BALANCE_SELECT = etree.XPath(".//select[@name='method']")
+_GAME_OPTIONS = etree.XPath(".//option[@value != '']")
+_APP_DATA = etree.XPath("string(/html/body/@data-app-data)", smart_strings=False)
+# "сегодня, ЧЧ:ММ" / "вчера, ЧЧ:ММ" / "ДД месяца, ЧЧ:ММ" / "ДД месяца ГГГГ, ЧЧ:ММ"
+_ORDER_DATE_RE = re.compile(r"\s*(?:(сегодня|сьогодні|today)|(вчера|вчора|yesterday)|(\d+)\s+(\w+)(?:\s+(\d{4}))?)"
+                            r",\s*(\d{1,2}):(\d{2})\s*$")
+_OFFER_FIELD_TAGS = {"tc-desc-text": "div", "tc-server": "div", "tc-price": "div", "tc-user": "div",
+                     "tc-amount": "div", "pseudo-a": "span"}
+_ORDER_FIELD_TAGS = {"tc-order": "div", "order-desc": "div", "tc-price": "div", "media-user-name": "div",
+                     "text-muted": "div", "tc-date-time": "div"}
+
+_SHORT_DESCRIPTION_LABELS = frozenset(("Краткое описание", "Короткий опис", "Short description"))
+_FULL_DESCRIPTION_LABELS = frozenset(("Подробное описание", "Докладний опис", "Detailed description"))
+_IMAGES_LABELS = frozenset(("Картинки", "Зображення", "Images"))
+_OFFER_NOT_FOUND_TEXTS = frozenset(("Предложение не найдено", "Пропозицію не знайдено", "Offer not found"))
+_AUTOREPLY_LABELS = frozenset(("автовідповідь", "автоответ", "auto-reply"))
+_SUPPORT_BADGES = frozenset(("поддержка", "підтримка", "support"))
+_MODERATION_BADGES = frozenset(("модерация", "модерація", "moderation"))
+_ARBITRATION_BADGES = frozenset(("арбитраж", "арбітраж", "arbitration"))
+_REFUNDED_STATUS_TEXTS = frozenset(("Возврат", "Повернення", "Refund"))
+_CLOSED_STATUS_TEXTS = frozenset(("Закрыт", "Закрито", "Closed"))
+# Заголовок параметра на странице заказа -> тип параметра (один поиск в словаре вместо цепочки сравнений).
+_ORDER_PARAMS = {label: kind for kind, labels in (
+    ("short_description", _SHORT_DESCRIPTION_LABELS),
+    ("full_description", _FULL_DESCRIPTION_LABELS),
+    ("sum", ("Сумма", "Сума", "Total")),
+    ("subcategory", ("Категория", "Категорія", "Category", "Валюта", "Currency")),
+    ("secrets", ("Оплаченный товар", "Оплаченные товары", "Оплачений товар", "Оплачені товари",
+                 "Paid product", "Paid products")),
+    ("amount", ("Количество", "Amount", "Кількість")),
+    ("opened", ("Відкрито", "Открыт", "Open")),
+    ("closed", ("Закрито", "Закрыт", "Closed")),
+    ("game", ("Игра", "Гра", "Game")),
+) for label in labels}
+
+
+def _html_parser(encoding: str | None = None) -> lxml_html.HTMLParser:
+    """
+    Возвращает HTML парсер lxml текущего потока (создается один раз на поток, т.к. парсеры lxml
+    нельзя использовать из нескольких потоков одновременно).
+    Если передана кодировка, возвращается парсер для байтов в этой кодировке (без комментариев и PI).
+    """
+    if encoding is None:
+        parser = getattr(_THREAD_LOCAL, "parser", None)
+        if parser is None:
+            parser = _THREAD_LOCAL.parser = lxml_html.HTMLParser(collect_ids=False)
+        return parser
+    parsers = getattr(_THREAD_LOCAL, "encoding_parsers", None)
+    if parsers is None:
+        parsers = _THREAD_LOCAL.encoding_parsers = {}
+    if (parser := parsers.get(encoding)) is None:
+        parser = parsers[encoding] = lxml_html.HTMLParser(encoding=encoding, huge_tree=True, remove_comments=True,
+                                                          remove_pis=True, collect_ids=False)
+    return parser
+
+
+def _parse_html(html: str | bytes):
+    """
+    Парсит HTML страницу (или ее фрагмент) и возвращает корневой элемент документа (<html>).
+    """
+    return lxml_html.document_fromstring(html, parser=_html_parser())
+
+
+def parse_html_bytes(content: bytes, encoding: str = "utf-8"):
+    """
+    Парсит HTML страницу в байтах (например, response.content) парсером текущего потока для переданной кодировки
+    и возвращает корневой элемент документа (<html>).
+    """
+    return lxml_html.document_fromstring(content, parser=_html_parser(encoding))
+
+
+def _parse_fragment(html: str):
+    """
+    Парсит HTML фрагмент (например, HTML отдельного сообщения) и возвращает оборачивающий его <div>.
+    """
+    return lxml_html.fragment_fromstring(html, create_parent="div", parser=_html_parser())
+
+
+def _check_logged_in(html: str | bytes, element: str):
+    """
+    Быстро (поиском подстроки, без разбора HTML) проверяет, что страница открыта авторизованным пользователем.
+    На странице без блока с ником пользователя разбор бессмысленен, поэтому исключение возбуждается сразу.
+
+    :param html: HTML страница.
+    :param element: название элемента для текста исключения.
+    """
+    if (b"user-link-name" if isinstance(html, bytes) else "user-link-name") not in html:
+        raise exceptions.funpay_apiError(f"Failed to parse an essential element ({element}). The page structure may have changed, or you may not be logged in.")
+
+
+def _get_app_data(parser) -> dict:
+    """
+    Возвращает распарсенный JSON из атрибута data-app-data тега <body>.
+    """
+    return utils.json_loads(_APP_DATA(parser))
+
+
+def _update_csrf_token(parser, account: Account):
     try:
-        app_data = json.loads(parser.find("body").get("data-app-data"))
+        app_data = _get_app_data(parser)
         account.csrf_token = app_data.get("csrf-token") or account.csrf_token
     except:
         logger.warning("Произошла ошибка при обновлении csrf.")
@@ -23,158 +230,181 @@ def parse_account_data(html: str, account: Account) -> None:
     """
     Parses the main page HTML to get account information.
     """
-    parser = BeautifulSoup(html, "lxml")
-    username = parser.find("div", {"class": "user-link-name"})
-    if not username:
+    _check_logged_in(html, "username")
+    parser = _parse_html(html)
+    username = _first(_USER_LINK_NAME(parser))
+    if username is None:
         raise exceptions.funpay_apiError("Failed to parse an essential element (username). The page structure may have changed, or you may not be logged in.")
-    account.username = username.text
-    app_data = json.loads(parser.find("body").get("data-app-data"))
+    account.username = _TEXT(username)
+    app_data = _get_app_data(parser)
     account.locale = app_data.get("locale")
     account.id = app_data["userId"]
     account.csrf_token = app_data["csrf-token"]
-    account._logout_link = parser.find("a", class_="menu-item-logout").get("href")
-    active_sales = parser.find("span", {"class": "badge badge-trade"})
-    account.active_sales = int(active_sales.text) if active_sales else 0
-    balance = parser.find("span", class_="badge badge-balance")
-    if balance:
-        balance, currency = balance.text.rsplit(" ", maxsplit=1)
+    account._logout_link = _first(_LOGOUT_LINK(parser)).get("href")
+    active_sales = _first(_BADGE_TRADE(parser))
+    account.active_sales = int(_TEXT(active_sales)) if active_sales is not None else 0
+    balance = _first(_BADGE_BALANCE(parser))
+    if balance is not None:
+        balance, currency = _TEXT(balance).rsplit(" ", maxsplit=1)
         account.total_balance = int(balance.replace(" ", ""))
         account.currency = utils.parse_currency(currency)
     else:
         account.total_balance = 0
-    active_purchases = parser.find("span", {"class": "badge badge-orders"})
-    account.active_purchases = int(active_purchases.text) if active_purchases else 0
+    active_purchases = _first(_BADGE_ORDERS(parser))
+    account.active_purchases = int(_TEXT(active_purchases)) if active_purchases is not None else 0
 
     if not account.is_initiated:
-        _setup_categories(html, account)
+        account._setup_categories(parser)
 
-def _setup_categories(html: str, account: Account):
+class SubcategoryPublicLotsParser:
     """
-    Парсит категории и подкатегории с основной страницы и добавляет их в свойства класса.
+    Потоковый парсер страницы с опубликованными лотами подкатегории.
+    Принимает HTML по частям (через :meth:`feed`) и разбирает каждый лот сразу после того, как он был получен,
+    освобождая память от уже обработанных строк таблицы.
 
-    :param html: HTML страница.
-    """
-    parser = BeautifulSoup(html, "lxml")
-    games_table = parser.find_all("div", {"class": "promo-game-list"})
-    if not games_table:
-        return
+    :param account: экземпляр аккаунта.
 
-    games_table = games_table[1] if len(games_table) > 1 else games_table[0]
-    games_divs = games_table.find_all("div", {"class": "promo-game-item"})
-    if not games_divs:
-        return
-    game_position = 0
-    subcategory_position = 0
-    for i in games_divs:
-        gid = int(i.find("div", {"class": "game-title"}).get("data-id"))
-        gname = i.find("a").text
-        regional_games = {
-            gid: types.Category(gid, gname, position=game_position)
-        }
-        game_position += 1
-        if regional_divs := i.find("div", {"role": "group"}):
-            for btn in regional_divs.find_all("button"):
-                regional_game_id = int(btn["data-id"])
-                regional_games[regional_game_id] = types.Category(regional_game_id, f"{gname} ({btn.text})",
-                                                                    position=game_position)
-                game_position += 1
-
-        subcategories_divs = i.find_all("ul", {"class": "list-inline"})
-        for j in subcategories_divs:
-            j_game_id = int(j["data-id"])
-            subcategories = j.find_all("li")
-            for k in subcategories:
-                a = k.find("a")
-                name, link = a.text, a["href"]
-                stype = types.SubCategoryTypes.CURRENCY if "chips" in link else types.SubCategoryTypes.COMMON
-                sid = int(link.split("/")[-2])
-                sobj = types.SubCategory(sid, name, stype, regional_games[j_game_id], subcategory_position)
-                subcategory_position += 1
-                regional_games[j_game_id].add_subcategory(sobj)
-                account._subcategories.append(sobj)
-                account._sorted_subcategories[stype][sid] = sobj
-
-        for gid in regional_games:
-            account._categories.append(regional_games[gid])
-            account._sorted_categories[gid] = regional_games[gid]
-
-def parse_subcategory_public_lots(html: str, account: Account, subcategory_type: enums.SubCategoryTypes, subcategory_id: int) -> list[types.LotShortcut]:
-    parser = BeautifulSoup(html, "lxml")
-
-    username = parser.find("div", {"class": "user-link-name"})
-    if not username:
-        raise exceptions.funpay_apiError("Failed to parse an essential element (balance). The page structure may have changed, or you may not be logged in.")
+    :param subcategory_type: тип подкатегории.
+    :type subcategory_type: :class:`funpay_api.common.enums.SubCategoryTypes`
 
-    _update_csrf_token(parser, account)
-    offers = parser.find_all("a", {"class": "tc-item"})
-    if not offers:
-        return []
+    :param subcategory_id: ID подкатегории.
+    :type subcategory_id: :obj:`int`
+    """
 
-    subcategory_obj = account.get_subcategory(subcategory_type, subcategory_id)
-    result = []
-    sellers = {}
-    currency = None
-    for offer in offers:
-        offer_id = offer["href"].split("id=")[1]
-        promo = 'offer-promo' in offer.get('class', [])
-        description = offer.find("div", {"class": "tc-desc-text"})
-        description = description.text if description else None
-        server = offer.find("div", class_="tc-server")
-        server = server.text if server else None
-        tc_price = offer.find("div", {"class": "tc-price"})
-        if subcategory_type is types.SubCategoryTypes.COMMON:
-            price = float(tc_price["data-s"])
+    def __init__(self, account: Account, subcategory_type: enums.SubCategoryTypes, subcategory_id: int):
+        self._account = account
+        self._subcategory_type = subcategory_type
+        self._subcategory_obj = account.get_subcategory(subcategory_type, subcategory_id)
+        # События нужны только для <body> (data-app-data), <div> (ник) и <a> (лоты): фильтрация по тегу
+        # выполняется внутри lxml, поэтому остальные элементы страницы до Python не доходят.
+        self._parser = etree.HTMLPullParser(events=("start", "end"), tag=("body", "div", "a"), encoding="utf-8",
+                                            remove_comments=True)
+        self._app_data: str | None = None
+        self._logged_in = False
+        self._currency: enums.Currency | None = None
+        self._sellers: dict[int, types.SellerShortcut] = {}
+        self._result: list[types.LotShortcut] = []
+
+    def feed(self, data: bytes | str):
+        """
+        Передает парсеру очередную часть HTML страницы.
+
+        :param data: часть HTML страницы.
+        :type data: :obj:`bytes` or :obj:`str`
+        """
+        self._parser.feed(data)
+        self._handle_events()
+
+    def close(self) -> list[types.LotShortcut]:
+        """
+        Завершает парсинг страницы.
+
+        :return: список всех опубликованных лотов подкатегории.
+        :rtype: :obj:`list` of :class:`funpay_api.types.LotShortcut`
+        """
+        self._parser.close()
+        self._handle_events()
+        if not self._logged_in:
+            raise exceptions.funpay_apiError("Failed to parse an essential element (balance). The page structure may have changed, or you may not be logged in.")
+
+        try:
+            app_data = utils.json_loads(self._app_data)
+            self._account.csrf_token = app_data.get("csrf-token") or self._account.csrf_token
+        except:
+            logger.warning("Произошла ошибка при обновлении csrf.")
+            logger.debug("TRACEBACK", exc_info=True)
+        if self._currency is not None and self._account.currency != self._currency:
+            self._account.currency = self._currency
+        return self._result
+
+    def _handle_events(self):
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if elem.tag == "body":
+                    self._app_data = elem.get("data-app-data")
+                continue
+            classes = elem.get("class", "").split()
+            if elem.tag == "div" and "user-link-name" in classes:
+                self._logged_in = True
+            elif elem.tag == "a" and "tc-item" in classes:
+                self._result.append(self._parse_offer(elem, classes))
+                elem.clear(keep_tail=True)
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+
+    def _parse_offer(self, offer, classes: list[str]) -> types.LotShortcut:
+        offer_id = offer.get("href").partition("id=")[2]
+        promo = "offer-promo" in classes
+        fields = _find_first_by_classes(offer, _OFFER_FIELD_TAGS)
+        description = fields.get("tc-desc-text")
+        description = _TEXT(description) if description is not None else None
+        server = fields.get("tc-server")
+        server = _TEXT(server) if server is not None else None
+        tc_price = fields["tc-price"]
+        if self._subcategory_type is types.SubCategoryTypes.COMMON:
+            price = float(tc_price.get("data-s"))
         else:
-            price = float(tc_price.find("div").text.rsplit(maxsplit=1)[0].replace(" ", ""))
-        if currency is None:
-            currency = utils.parse_currency(tc_price.find("span", class_="unit").text)
-            if account.currency != currency:
-                account.currency = currency
-        seller_soup = offer.find("div", class_="tc-user")
-        attributes = {k.replace("data-", "", 1): int(v) if v.isdigit() else v for k, v in offer.attrs.items()
-                        if k.startswith("data-")}
-
-        auto = attributes.get("auto") == 1
-        tc_amount = offer.find("div", class_="tc-amount")
-        amount = tc_amount.text.replace(" ", "") if tc_amount else None
-        amount = int(amount) if amount and amount.isdigit() else None
-        seller_key = str(seller_soup)
-        if seller_key not in sellers:
-            online = False
-            if attributes.get("online") == 1:
-                online = True
-            seller_body = offer.find("div", class_="media-body")
-            username = seller_body.find("div", class_="media-user-name").text.strip()
-            rating_stars = seller_body.find("div", class_="rating-stars")
+            price = float(_DIV_TEXT(tc_price).rsplit(maxsplit=1)[0].replace(" ", ""))
+        if self._currency is None:
+            self._currency = utils.parse_currency(_UNIT_TEXT(tc_price))
+        seller_soup = fields.get("tc-user")
+        attributes = {}
+        online = auto = False
+        for k, v in offer.attrib.items():
+            if not k.startswith("data-"):
+                continue
+            key = k[5:]
+            value = int(v) if v.isdigit() else v
+            if key == "online":
+                online = value == 1
+            elif key == "auto":
+                auto = value == 1
+            else:
+                attributes[key] = value
+
+        amount = _parse_amount(fields.get("tc-amount"))
+        # Продавцы кэшируются по ID, а не по HTML-коду блока: сериализация нужна только для новых продавцов.
+        user_id = attributes.get("user")
+        if not isinstance(user_id, int):
+            user_id = int(fields["pseudo-a"].get("data-href").rsplit("/", 2)[-2])
+        if (seller := self._sellers.get(user_id)) is None:
+            seller_body = _first(_MEDIA_BODY(seller_soup))
+            username = _TEXT(_first(_MEDIA_USER_NAME(seller_body))).strip()
+            rating_stars = _first(_RATING_STARS(seller_body))
             if rating_stars is not None:
-                rating_stars = len(rating_stars.find_all("i", class_="fas"))
-            k_reviews = seller_body.find("div", class_="media-user-reviews")
-            if k_reviews:
-                k_reviews = "".join([i for i in k_reviews.text if i.isdigit()])
+                rating_stars = int(_COUNT_FAS_STARS(rating_stars))
+            k_reviews = _first(_MEDIA_USER_REVIEWS(seller_body))
+            if k_reviews is not None:
+                k_reviews = _NON_DIGITS_RE.sub("", _TEXT(k_reviews))
             k_reviews = int(k_reviews) if k_reviews else 0
-            user_id = int(seller_body.find("span", class_="pseudo-a")["data-href"].split("/")[-2])
-            seller = types.SellerShortcut(user_id, username, online, rating_stars, k_reviews, seller_key)
-            sellers[seller_key] = seller
-        else:
-            seller = sellers[seller_key]
-        for i in ("online", "auto"):
-            if i in attributes:
-                del attributes[i]
+            seller = types.SellerShortcut(user_id, username, online, rating_stars, k_reviews,
+                                          _outer_html(seller_soup))
+            self._sellers[user_id] = seller
+
+        # HTML сериализуется сразу (а не лениво, как в остальных парсерах): после разбора строка таблицы очищается.
+        return types.LotShortcut(offer_id, server, description, amount, price, self._currency, self._subcategory_obj,
+                                 seller, auto, promo, attributes,
+                                 _outer_html(offer))
+
+
+def parse_subcategory_public_lots(html: str | bytes, account: Account, subcategory_type: enums.SubCategoryTypes,
+                                  subcategory_id: int) -> list[types.LotShortcut]:
+    _check_logged_in(html, "balance")
+    parser = SubcategoryPublicLotsParser(account, subcategory_type, subcategory_id)
+    parser.feed(html)
+    return parser.close()
 
-        lot_obj = types.LotShortcut(offer_id, server, description, amount, price, currency, subcategory_obj, seller,
-                                    auto, promo, attributes, str(offer))
-        result.append(lot_obj)
-    return result
 
 def parse_my_subcategory_lots(html: str, account: Account, subcategory_id: int) -> list[types.MyLotShortcut]:
-    parser = BeautifulSoup(html, "lxml")
+    _check_logged_in(html, "lot description")
+    parser = _parse_html(html)
 
-    username = parser.find("div", {"class": "user-link-name"})
-    if not username:
+    username = _first(_USER_LINK_NAME(parser))
+    if username is None:
         raise exceptions.funpay_apiError("Failed to parse an essential element (lot description). The page structure may have changed, or you may not be logged in.")
 
     _update_csrf_token(parser, account)
-    offers = parser.find_all("a", class_="tc-item")
+    offers = _TC_ITEMS(parser)
     if not offers:
         return []
 
@@ -182,45 +412,44 @@ def parse_my_subcategory_lots(html: str, account: Account, subcategory_id: int)
     result = []
     currency = None
     for offer in offers:
-        offer_id = offer["data-offer"]
-        description = offer.find("div", {"class": "tc-desc-text"})
-        description = description.text if description else None
-        server = offer.find("div", class_="tc-server")
-        server = server.text if server else None
-        tc_price = offer.find("div", class_="tc-price")
-        price = float(tc_price["data-s"])
+        offer_id = offer.get("data-offer")
+        description = _first(_TC_DESC_TEXT(offer))
+        description = _TEXT(description) if description is not None else None
+        server = _first(_TC_SERVER(offer))
+        server = _TEXT(server) if server is not None else None
+        tc_price = _first(_TC_PRICE(offer))
+        price = float(tc_price.get("data-s"))
         if currency is None:
-            currency = utils.parse_currency(tc_price.find("span", class_="unit").text)
+            currency = utils.parse_currency(_UNIT_TEXT(tc_price))
             if account.currency != currency:
                 account.currency = currency
-        auto = bool(tc_price.find("i", class_="auto-dlv-icon"))
-        tc_amount = offer.find("div", class_="tc-amount")
-        amount = tc_amount.text.replace(" ", "") if tc_amount else None
-        amount = int(amount) if amount and amount.isdigit() else None
-        active = "warning" not in offer.get("class", [])
+        auto = _HAS_AUTO_DLV_ICON(tc_price)
+        amount = _parse_amount(_first(_TC_AMOUNT(offer)))
+        active = "warning" not in offer.get("class", "").split()
         lot_obj = types.MyLotShortcut(offer_id, server, description, amount, price, currency, subcategory_obj,
-                                        auto, active, str(offer))
+                                        auto, active, partial(_outer_html, offer))
         result.append(lot_obj)
     return result
 
 def parse_lot_page(html: str, account: Account, lot_id: int) -> types.LotPage | None:
-    parser = BeautifulSoup(html, "lxml")
-    username = parser.find("div", {"class": "user-link-name"})
-    if not username:
+    _check_logged_in(html, "chat")
+    parser = _parse_html(html)
+    username = _first(_USER_LINK_NAME(parser))
+    if username is None:
         raise exceptions.funpay_apiError("Failed to parse an essential element (chat). The page structure may have changed, or you may not be logged in.")
 
     _update_csrf_token(parser, account)
 
-    if (page_header := parser.find("h1", class_="page-header")) \
-            and page_header.text in ("Предложение не найдено", "Пропозицію не знайдено", "Offer not found"):
+    if (page_header := _first(_PAGE_HEADER(parser))) is not None \
+            and _TEXT(page_header) in _OFFER_NOT_FOUND_TEXTS:
         return None
 
-    subcategory_id = int(parser.find("a", class_="js-back-link")['href'].split("/")[-2])
-    chat_header = parser.find("div", class_="chat-header")
-    if chat_header:
-        seller = chat_header.find("div", class_="media-user-name").find("a")
-        seller_id = int(seller["href"].split("/")[-2])
-        seller_username = seller.text
+    subcategory_id = int(_first(_BACK_LINK(parser)).get("href").rsplit("/", 2)[-2])
+    chat_header = _first(_CHAT_HEADER(parser))
+    if chat_header is not None:
+        seller = _first(_MEDIA_USER_NAME(chat_header)).find(".//a")
+        seller_id = int(seller.get("href").rsplit("/", 2)[-2])
+        seller_username = _TEXT(seller)
     else:
         seller_id = account.id
         seller_username = account.username
@@ -228,14 +457,15 @@ def parse_lot_page(html: str, account: Account, lot_id: int) -> types.LotPage |
     short_description = None
     detailed_description = None
     image_urls = []
-    for param_item in parser.find_all("div", class_="param-item"):
-        if param_name := param_item.find("h5"):
-            if param_name.text in ("Краткое описание", "Короткий опис", "Short description"):
-                short_description = param_item.find("div").text
-            elif param_name.text in ("Подробное описание", "Докладний опис", "Detailed description"):
-                detailed_description = param_item.find("div").text
-            elif param_name in ("Картинки", "Зображення", "Images"):
-                photos = param_item.find_all("a", class_="attachments-thumb")
+    for param_item in _PARAM_ITEMS(parser):
+        if (param_name := param_item.find(".//h5")) is not None:
+            param_name = _TEXT(param_name)
+            if param_name in _SHORT_DESCRIPTION_LABELS:
+                short_description = _DIV_TEXT(param_item)
+            elif param_name in _FULL_DESCRIPTION_LABELS:
+                detailed_description = _DIV_TEXT(param_item)
+            elif param_name in _IMAGES_LABELS:
+                photos = _ATTACHMENTS_THUMBS(param_item)
                 if photos:
                     image_urls = [photo.get("href") for photo in photos]
 
@@ -243,88 +473,129 @@ def parse_lot_page(html: str, account: Account, lot_id: int) -> types.LotPage |
                             short_description, detailed_description, image_urls, seller_id, seller_username)
 
 def parse_balance(html: str, account: Account) -> types.Balance:
-    parser = BeautifulSoup(html, "lxml")
+    _check_logged_in(html, "user profile")
+    parser = _parse_html(html)
 
-    username = parser.find("div", {"class": "user-link-name"})
-    if not username:
+    username = _first(_USER_LINK_NAME(parser))
+    if username is None:
         raise exceptions.funpay_apiError("Failed to parse an essential element (user profile). The page structure may have changed, or you may not be logged in.")
 
     _update_csrf_token(parser, account)
 
-    balances = parser.find("select", {"name": "method"})
-    balance = types.Balance(float(balances["data-balance-total-rub"]), float(balances["data-balance-rub"]),
-                            float(balances["data-balance-total-usd"]), float(balances["data-balance-usd"]),
-                            float(balances["data-balance-total-eur"]), float(balances["data-balance-eur"]))
+    balances = _first(_BALANCE_SELECT(parser))
+    balance = types.Balance(float(balances.get("data-balance-total-rub")), float(balances.get("data-balance-rub")),
+                            float(balances.get("data-balance-total-usd")), float(balances.get("data-balance-usd")),
+                            float(balances.get("data-balance-total-eur")), float(balances.get("data-balance-eur")))
     return balance
 
 def parse_chat_history(json_response: dict, account: Account, chat_id: int | str, interlocutor_username: str | None, from_id: int) -> list[types.Message]:
-    if not json_response.get("chat") or not json_response["chat"].get("messages"):
+    chat = json_response.get("chat")
+    if not chat or not chat.get("messages"):
         return []
-    if json_response["chat"]["node"]["silent"]:
+    node = chat["node"]
+    if node["silent"]:
         interlocutor_id = None
     else:
-        interlocutors = json_response["chat"]["node"]["name"].split("-")[1:]
+        interlocutors = node["name"].split("-")[1:]
         interlocutors.remove(str(account.id))
         interlocutor_id = int(interlocutors[0])
 
-    return _parse_messages(json_response["chat"]["messages"], account, chat_id, interlocutor_id,
+    return _parse_messages(chat["messages"], account, chat_id, interlocutor_id,
                                     interlocutor_username, from_id)
 
 def parse_chats_histories(json_response: dict, account: Account, chats_data: dict[int | str, str | None]) -> dict[int, list[types.Message]]:
     result = {}
+    histories_cache = account._histories_cache
     for i in json_response["objects"]:
-        if i.get("type") == "c-p-u":
+        object_type = i.get("type")
+        if object_type == "c-p-u":
             bv = account.parse_buyer_viewing(i) # This should be moved to parser
             account.runner.buyers_viewing[bv.buyer_id] = bv
-        elif i.get("type") == "chat_node":
-            if not i.get("data"):
-                result[i.get("id")] = []
+        elif object_type == "chat_node":
+            chat_id = i.get("id")
+            if not (data := i.get("data")):
+                result[chat_id] = []
                 continue
-            if i["data"]["node"]["silent"]:
+            node = data["node"]
+            json_messages = data["messages"]
+            if node["silent"]:
                 interlocutor_id = None
                 interlocutor_name = None
             else:
-                interlocutors = i["data"]["node"]["name"].split("-")[1:]
+                interlocutors = node["name"].split("-")[1:]
                 interlocutors.remove(str(account.id))
                 interlocutor_id = int(interlocutors[0])
-                interlocutor_name = chats_data[i.get("id")]
-            messages = _parse_messages(i["data"]["messages"], account, i.get("id"), interlocutor_id, interlocutor_name)
-            result[i.get("id")] = messages
+                interlocutor_name = chats_data[chat_id]
+            # Если с прошлого запроса история чата не изменилась, повторно ее не парсим.
+            # В кэше хранятся только дайджест сообщений и эталонные объекты; наружу всегда отдаются копии,
+            # т.к. вызывающий код (напр. Runner, проставляющий by_bot) изменяет полученные сообщения.
+            key = (interlocutor_id, interlocutor_name, _messages_digest(json_messages))
+            cached = histories_cache.get(chat_id)
+            if cached is not None and cached[0] == key:
+                result[chat_id] = [copy.copy(m) for m in cached[1]]
+                continue
+            messages = _parse_messages(json_messages, account, chat_id, interlocutor_id, interlocutor_name)
+            histories_cache[chat_id] = (key, messages)
+            result[chat_id] = [copy.copy(m) for m in messages]
     return result
 
+
+def _messages_digest(json_messages: list[dict]) -> bytes:
+    """
+    Возвращает дайджест ID и HTML сообщений чата (чтобы не хранить HTML всей истории повторно).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for m in json_messages:
+        digest.update(f"{m['id']}\0{m['html']}\0".encode())
+    return digest.digest()
+
+
 def _parse_messages(json_messages: dict, account: Account, chat_id: int | str,
                     interlocutor_id: int | None = None, interlocutor_username: str | None = None,
                     from_id: int = 0) -> list[types.Message]:
     messages = []
+    default_labels = []
     ids = {account.id: account.username, 0: "FunPay"}
     badges = {}
     if interlocutor_id is not None:
         ids[interlocutor_id] = interlocutor_username
+    is_private = account.chat_id_private(chat_id)
+    account_id = account.id
+    bot_character = account.bot_character
+    old_bot_character = account.old_bot_character
 
     for i in json_messages:
         if i["id"] < from_id:
             continue
         author_id = i["author"]
-        parser = BeautifulSoup(i["html"].replace("<br>", "\n"), "lxml")
+        html = i["html"]
+        parser = _parse_fragment(html.replace("<br>", "\n"))
+        # Большинство сообщений - обычный текст без блока автора и без картинки: дешевая проверка подстрок
+        # позволяет не выполнять для них XPath-поиски этих блоков.
+        has_author_div = "media-user-name" in html
+        has_image = "chat-img-link" in html
 
         # Если ник или бейдж написавшего неизвестен, но есть блок с данными об авторе сообщения
-        if None in [ids.get(author_id), badges.get(author_id)] and (
-                author_div := parser.find("div", {"class": "media-user-name"})):
-            if badges.get(author_id) is None:
-                badge = author_div.find("span", {"class": "chat-msg-author-label label label-success"})
-                badges[author_id] = badge.text if badge else 0
-            if ids.get(author_id) is None:
-                author = author_div.find("a").text.strip()
+        author_div = _first(_MEDIA_USER_NAME(parser)) if has_author_div else None
+        author = ids.get(author_id)
+        badge = badges.get(author_id)
+        if (author is None or badge is None) and author_div is not None:
+            if badge is None:
+                badge = _first(_SUCCESS_LABEL(author_div))
+                badges[author_id] = _TEXT(badge) if badge is not None else 0
+            if author is None:
+                author = _TEXT(author_div.find(".//a")).strip()
                 ids[author_id] = author
-                if account.chat_id_private(chat_id) and author_id == interlocutor_id and not interlocutor_username:
+                if is_private and author_id == interlocutor_id and not interlocutor_username:
                     interlocutor_username = author
                     ids[interlocutor_id] = interlocutor_username
         by_bot = False
         by_vertex = False
         image_name = None
-        if account.chat_id_private(chat_id) and (image_tag := parser.find("a", {"class": "chat-img-link"})):
-            image_name = image_tag.find("img")
-            image_name = image_name.get('alt') if image_name else None
+        if has_image and is_private and \
+                (image_tag := _first(_CHAT_IMG_LINK(parser))) is not None:
+            image_name = image_tag.find(".//img")
+            image_name = image_name.get('alt') if image_name is not None else None
             image_link = image_tag.get("href")
             message_text = None
             # "Отправлено_с_помощью_бота_FunPay_Cardinal.png", "funpay_cardinal_image.png"
@@ -336,12 +607,12 @@ def _parse_messages(json_messages: dict, account: Account, chat_id: int | str,
         else:
             image_link = None
             if author_id == 0:
-                message_text = parser.find("div", role="alert").text.strip()
+                message_text = _TEXT(_first(_ALERT(parser))).strip()
             else:
-                message_text = parser.find("div", {"class": "chat-msg-text"}).text
+                message_text = _CHAT_MSG_TEXT_STR(parser)
 
-            if message_text.startswith(account.bot_character) or \
-                    message_text.startswith(account.old_bot_character) and author_id == account.id:
+            if message_text.startswith(bot_character) or \
+                    message_text.startswith(old_bot_character) and author_id == account_id:
                 message_text = message_text[1:]
                 by_bot = True
             # todo придумать, как отсеять юзеров со старыми версиями кардинала (подождать обнову фп?)
@@ -349,147 +620,156 @@ def _parse_messages(json_messages: dict, account: Account, chat_id: int | str,
             #     by_vertex = True
 
         message_obj = types.Message(i["id"], message_text, chat_id, interlocutor_username, interlocutor_id,
-                                    None, author_id, i["html"], image_link, image_name, determine_msg_type=False)
+                                    None, author_id, html, image_link, image_name, determine_msg_type=False)
         message_obj.by_bot = by_bot
         message_obj.by_vertex = by_vertex
         message_obj.type = types.MessageTypes.NON_SYSTEM if author_id != 0 else message_obj.get_message_type()
 
+        default_label = _first(_DEFAULT_LABEL(author_div)) if author_div is not None else None
+        if default_label is not None:
+            default_label = _TEXT(default_label)
+            if default_label in _AUTOREPLY_LABELS:
+                message_obj.is_autoreply = True
+        if message_obj.type != types.MessageTypes.NON_SYSTEM:
+            _set_initiator(message_obj, _USER_LINKS(parser), account)
+
         messages.append(message_obj)
+        default_labels.append(default_label)
 
-    for i in messages:
+    # Ники и бейджи авторов становятся известны только после обхода всех сообщений,
+    # поэтому они проставляются отдельным проходом, без повторного разбора HTML.
+    for i, default_label in zip(messages, default_labels):
         i.author = ids.get(i.author_id)
         i.chat_name = interlocutor_username
-        i.badge = badges.get(i.author_id) if badges.get(i.author_id) != 0 else None
-        parser = BeautifulSoup(i.html, "lxml")
+        badge = badges.get(i.author_id)
+        i.badge = badge if badge != 0 else None
         if i.badge:
             i.is_employee = True
-            if i.badge in ("поддержка", "підтримка", "support"):
+            if i.badge in _SUPPORT_BADGES:
                 i.is_support = True
-            elif i.badge in ("модерация", "модерація", "moderation"):
+            elif i.badge in _MODERATION_BADGES:
                 i.is_moderation = True
-            elif i.badge in ("арбитраж", "арбітраж", "arbitration"):
+            elif i.badge in _ARBITRATION_BADGES:
                 i.is_arbitration = True
-        default_label = parser.find("div", {"class": "media-user-name"})
-        default_label = default_label.find("span", {
-            "class": "chat-msg-author-label label label-default"}) if default_label else None
-        if default_label:
-            if default_label.text in ("автовідповідь", "автоответ", "auto-reply"):
-                i.is_autoreply = True
-        i.badge = default_label.text if (i.badge is None and default_label is not None) else i.badge
-        if i.type != types.MessageTypes.NON_SYSTEM:
-            users = parser.find_all('a', href=lambda href: href and '/users/' in href)
-            if users:
-                i.initiator_username = users[0].text
-                i.initiator_id = int(users[0]["href"].split("/")[-2])
-                if i.type in (types.MessageTypes.ORDER_PURCHASED, types.MessageTypes.ORDER_CONFIRMED,
-                                types.MessageTypes.NEW_FEEDBACK,
-                                types.MessageTypes.FEEDBACK_CHANGED,
-                                types.MessageTypes.FEEDBACK_DELETED):
-                    if i.initiator_id == account.id:
-                        i.i_am_seller = False
-                        i.i_am_buyer = True
-                    else:
-                        i.i_am_seller = True
-                        i.i_am_buyer = False
-                elif i.type in (types.MessageTypes.NEW_FEEDBACK_ANSWER, types.MessageTypes.FEEDBACK_ANSWER_CHANGED,
-                                types.MessageTypes.FEEDBACK_ANSWER_DELETED, types.MessageTypes.REFUND):
-                    if i.initiator_id == account.id:
-                        i.i_am_seller = True
-                        i.i_am_buyer = False
-                    else:
-                        i.i_am_seller = False
-                        i.i_am_buyer = True
-                elif len(users) > 1:
-                    last_user_id = int(users[-1]["href"].split("/")[-2])
-                    if i.type == types.MessageTypes.ORDER_CONFIRMED_BY_ADMIN:
-                        if last_user_id == account.id:
-                            i.i_am_seller = True
-                            i.i_am_buyer = False
-                        else:
-                            i.i_am_seller = False
-                            i.i_am_buyer = True
-                    elif i.type == types.MessageTypes.REFUND_BY_ADMIN:
-                        if last_user_id == account.id:
-                            i.i_am_seller = False
-                            i.i_am_buyer = True
-                        else:
-                            i.i_am_seller = True
-                            i.i_am_buyer = False
+        i.badge = default_label if (i.badge is None and default_label is not None) else i.badge
 
     return messages
 
+
+def _set_initiator(message: types.Message, users: list, account: Account):
+    """
+    Заполняет инициатора системного сообщения и роль аккаунта (продавец / покупатель) по ссылкам на пользователей.
+    """
+    if not users:
+        return
+    message.initiator_username = _TEXT(users[0])
+    message.initiator_id = int(users[0].get("href").rsplit("/", 2)[-2])
+    if message.type in (types.MessageTypes.ORDER_PURCHASED, types.MessageTypes.ORDER_CONFIRMED,
+                        types.MessageTypes.NEW_FEEDBACK,
+                        types.MessageTypes.FEEDBACK_CHANGED,
+                        types.MessageTypes.FEEDBACK_DELETED):
+        if message.initiator_id == account.id:
+            message.i_am_seller = False
+            message.i_am_buyer = True
+        else:
+            message.i_am_seller = True
+            message.i_am_buyer = False
+    elif message.type in (types.MessageTypes.NEW_FEEDBACK_ANSWER, types.MessageTypes.FEEDBACK_ANSWER_CHANGED,
+                          types.MessageTypes.FEEDBACK_ANSWER_DELETED, types.MessageTypes.REFUND):
+        if message.initiator_id == account.id:
+            message.i_am_seller = True
+            message.i_am_buyer = False
+        else:
+            message.i_am_seller = False
+            message.i_am_buyer = True
+    elif len(users) > 1:
+        last_user_id = int(users[-1].get("href").rsplit("/", 2)[-2])
+        if message.type == types.MessageTypes.ORDER_CONFIRMED_BY_ADMIN:
+            if last_user_id == account.id:
+                message.i_am_seller = True
+                message.i_am_buyer = False
+            else:
+                message.i_am_seller = False
+                message.i_am_buyer = True
+        elif message.type == types.MessageTypes.REFUND_BY_ADMIN:
+            if last_user_id == account.id:
+                message.i_am_seller = False
+                message.i_am_buyer = True
+            else:
+                message.i_am_seller = True
+                message.i_am_buyer = False
+
 def parse_user_profile(html: str, account: Account, user_id: int) -> types.UserProfile:
-    parser = BeautifulSoup(html, "lxml")
+    _check_logged_in(html, "order page")
+    parser = _parse_html(html)
 
-    username = parser.find("div", {"class": "user-link-name"})
-    if not username:
+    username = _first(_USER_LINK_NAME(parser))
+    if username is None:
         raise exceptions.funpay_apiError("Failed to parse an essential element (order page). The page structure may have changed, or you may not be logged in.")
 
     _update_csrf_token(parser, account)
 
-    username = parser.find("span", {"class": "mr4"}).text
-    user_status = parser.find("span", {"class": "media-user-status"})
-    user_status = user_status.text if user_status else ""
-    avatar_link = parser.find("div", {"class": "avatar-photo"}).get("style").split("(")[1].split(")")[0]
+    username = _TEXT(_first(_PROFILE_USERNAME(parser)))
+    user_status = _first(_MEDIA_USER_STATUS(parser))
+    user_status = _TEXT(user_status) if user_status is not None else ""
+    avatar_link = _first(_AVATAR_PHOTO(parser)).get("style").split("(")[1].split(")")[0]
     avatar_link = avatar_link if avatar_link.startswith("https") else f"https://funpay.com{avatar_link}"
-    banned = bool(parser.find("span", {"class": "label label-danger"}))
+    banned = _HAS_DANGER_LABEL(parser)
     user_obj = types.UserProfile(user_id, username, avatar_link, "Онлайн" in user_status or "Online" in user_status,
                                     banned, html)
 
-    subcategories_divs = parser.find_all("div", {"class": "offer-list-title-container"})
+    subcategories_divs = _OFFER_LIST_TITLES(parser)
 
     if not subcategories_divs:
         return user_obj
 
     for i in subcategories_divs:
-        subcategory_link = i.find("h3").find("a").get("href")
-        subcategory_id = int(subcategory_link.split("/")[-2])
+        subcategory_link = _OFFER_LIST_TITLE_HREF(i)
+        subcategory_id = int(subcategory_link.rsplit("/", 2)[-2])
         subcategory_type = types.SubCategoryTypes.CURRENCY if "chips" in subcategory_link else \
             types.SubCategoryTypes.COMMON
         subcategory_obj = account.get_subcategory(subcategory_type, subcategory_id)
         if not subcategory_obj:
             continue
 
-        offers = i.parent.find_all("a", {"class": "tc-item"})
+        offers = _TC_ITEMS(i.getparent())
         currency = None
         for j in offers:
-            offer_id = j["href"].split("id=")[1]
-            description = j.find("div", {"class": "tc-desc-text"})
-            description = description.text if description else None
-            server = j.find("div", class_="tc-server")
-            server = server.text if server else None
-            auto = j.find("i", class_="auto-dlv-icon") is not None
-            tc_price = j.find("div", {"class": "tc-price"})
-            tc_amount = j.find("div", class_="tc-amount")
-            amount = tc_amount.text.replace(" ", "") if tc_amount else None
-            amount = int(amount) if amount and amount.isdigit() else None
+            offer_id = j.get("href").partition("id=")[2]
+            description = _first(_TC_DESC_TEXT(j))
+            description = _TEXT(description) if description is not None else None
+            server = _first(_TC_SERVER(j))
+            server = _TEXT(server) if server is not None else None
+            auto = _HAS_AUTO_DLV_ICON(j)
+            tc_price = _first(_TC_PRICE(j))
+            amount = _parse_amount(_first(_TC_AMOUNT(j)))
             if subcategory_obj.type is types.SubCategoryTypes.COMMON:
-                price = float(tc_price["data-s"])
+                price = float(tc_price.get("data-s"))
             else:
-                price = float(tc_price.find("div").text.rsplit(maxsplit=1)[0].replace(" ", ""))
+                price = float(_DIV_TEXT(tc_price).rsplit(maxsplit=1)[0].replace(" ", ""))
             if currency is None:
-                currency = utils.parse_currency(tc_price.find("span", class_="unit").text)
+                currency = utils.parse_currency(_UNIT_TEXT(tc_price))
                 if account.currency != currency:
                     account.currency = currency
             lot_obj = types.LotShortcut(offer_id, server, description, amount, price, currency, subcategory_obj,
                                         None, auto,
-                                        None, None, str(j))
+                                        None, None, partial(_outer_html, j))
             user_obj.add_lot(lot_obj)
     return user_obj
 
 def parse_chat(html: str, account: Account, chat_id: int, with_history: bool) -> types.Chat:
-    parser = BeautifulSoup(html, "lxml")
-    if (name := parser.find("div", {"class": "chat-header"}).find("div", {"class": "media-user-name"}).find(
-            "a").text) in ("Чат", "Chat"):
+    parser = _parse_html(html)
+    chat_header = _first(_CHAT_HEADER(parser))
+    if (name := _TEXT(_first(_MEDIA_USER_NAME(chat_header)).find(".//a"))) in ("Чат", "Chat"):
         raise Exception("chat not found")  # todo
 
     _update_csrf_token(parser, account)
 
-    if not (chat_panel := parser.find("div", {"class": "param-item chat-panel"})):
+    if (chat_panel := _first(_CHAT_PANEL(parser))) is None:
         text, link = None, None
     else:
-        a = chat_panel.find("a")
-        text, link = a.text, a["href"]
+        a = chat_panel.find(".//a")
+        text, link = _TEXT(a), a.get("href")
     if with_history:
         history = account.get_chat_history(chat_id, interlocutor_username=name)
     else:
@@ -497,17 +777,18 @@ def parse_chat(html: str, account: Account, chat_id: int, with_history: bool) ->
     return types.Chat(chat_id, name, link, text, html, history)
 
 def parse_order(html: str, account: Account, order_id: str) -> types.Order:
-    parser = BeautifulSoup(html, "lxml")
-    username = parser.find("div", {"class": "user-link-name"})
-    if not username:
+    _check_logged_in(html, "sales page")
+    parser = _parse_html(html)
+    username = _first(_USER_LINK_NAME(parser))
+    if username is None:
         raise exceptions.funpay_apiError("Failed to parse an essential element (sales page). The page structure may have changed, or you may not be logged in.")
 
     _update_csrf_token(parser, account)
 
-    if (span := parser.find("span", {"class": "text-warning"})) and span.text in (
-            "Возврат", "Повернення", "Refund"):
+    if (span := _first(_TEXT_WARNING(parser))) is not None and _TEXT(span) in _REFUNDED_STATUS_TEXTS:
         status = types.OrderStatuses.REFUNDED
-    elif (span := parser.find("span", {"class": "text-success"})) and span.text in ("Закрыт", "Закрито", "Closed"):
+    elif (span := _first(_TEXT_SUCCESS(parser))) is not None \
+            and _TEXT(span) in _CLOSED_STATUS_TEXTS:
         status = types.OrderStatuses.CLOSED
     else:
         status = types.OrderStatuses.PAID
@@ -523,63 +804,61 @@ def parse_order(html: str, account: Account, order_id: str) -> types.Order:
     buyer_params = {}
 
     amount = 1
-    for div in parser.find_all("div", {"class": "param-item"}):
-        if not (h := div.find("h5")):
+    for div in _PARAM_ITEMS(parser):
+        if (h := div.find(".//h5")) is None:
             continue
-        if not stop_params and div.find_previous("hr"):
+        if not stop_params and _HAS_PRECEDING_HR(div):
             stop_params = True
 
-        if h.text in ("Краткое описание", "Короткий опис", "Short description"):
+        h = _TEXT(h)
+        kind = _ORDER_PARAMS.get(h)
+        if kind == "short_description":
             stop_params = True
-            short_description = div.find("div").text
-        elif h.text in ("Подробное описание", "Докладний опис", "Detailed description"):
+            short_description = _DIV_TEXT(div)
+        elif kind == "full_description":
             stop_params = True
-            full_description = div.find("div").text
-        elif h.text in ("Сумма", "Сума", "Total"):
-            sum_ = float(div.find("span").text.replace(" ", ""))
-            currency = utils.parse_currency(div.find("strong").text)
-        elif h.text in ("Категория", "Категорія", "Category",
-                        "Валюта", "Currency"):
-            subcategory_link = div.find("a").get("href")
-            subcategory_split = subcategory_link.split("/")
-            subcategory_id = int(subcategory_split[-2])
+            full_description = _DIV_TEXT(div)
+        elif kind == "sum":
+            sum_ = float(_TEXT(div.find(".//span")).replace(" ", ""))
+            currency = utils.parse_currency(_TEXT(div.find(".//strong")))
+        elif kind == "subcategory":
+            subcategory_link = div.find(".//a").get("href")
+            subcategory_id = int(subcategory_link.rsplit("/", 2)[-2])
             subcategory_type = types.SubCategoryTypes.COMMON if "lots" in subcategory_link else \
                 types.SubCategoryTypes.CURRENCY
             subcategory = account.get_subcategory(subcategory_type, subcategory_id)
-        elif h.text in ("Оплаченный товар", "Оплаченные товары",
-                        "Оплачений товар", "Оплачені товари",
-                        "Paid product", "Paid products"):
-            secret_placeholders = div.find_all("span", class_="secret-placeholder")
-            order_secrets = [i.text for i in secret_placeholders]
-        elif h.text in ("Количество", "Amount", "Кількість"):
-            div2 = div.find("div", class_="text-bold")
-            if div2:
-                match = utils.RegularExpressions().PRODUCTS_AMOUNT_ORDER.fullmatch(div2.text)
+        elif kind == "secrets":
+            secret_placeholders = _SECRET_PLACEHOLDERS(div)
+            order_secrets = [_TEXT(i) for i in secret_placeholders]
+        elif kind == "amount":
+            div2 = _first(_TEXT_BOLD(div))
+            if div2 is not None:
+                match = utils.RegularExpressions.PRODUCTS_AMOUNT_ORDER.fullmatch(_TEXT(div2))
                 if match:
                     amount = int(match.group(1).replace(" ", ""))
-        elif h.text in ("Відкрито", "Открыт", "Open"):
+        elif kind == "opened":
             continue  # todo
-        elif h.text in ("Закрито", "Закрыт", "Closed"):
+        elif kind == "closed":
             continue  # todo
-        elif not stop_params and h.text not in ("Игра", "Гра", "Game"):
-            div2 = div.find("div")
-            if div2:
-                res = div2.text.strip()
-                lot_params.append((h.text, res))
+        elif not stop_params and kind != "game":
+            div2 = div.find(".//div")
+            if div2 is not None:
+                res = _TEXT(div2).strip()
+                lot_params.append((h, res))
         elif stop_params:
-            div2 = div.find("div", class_="text-bold")
-            if div2:
-                buyer_params[h.text] = div2.text
+            div2 = _first(_TEXT_BOLD(div))
+            if div2 is not None:
+                buyer_params[h] = _TEXT(div2)
     if not stop_params:
         lot_params = []
 
-    chat = parser.find("div", {"class": "chat-header"})
-    chat_link = chat.find("div", {"class": "media-user-name"}).find("a")
-    interlocutor_name = chat_link.text
-    interlocutor_id = int(chat_link.get("href").split("/")[-2])
-    nav_bar = parser.find("ul", {"class": "nav navbar-nav navbar-right logged"})
-    active_item = nav_bar.find("li", {"class": "active"})
-    if any(i in active_item.find("a").text.strip() for i in ("Продажи", "Продажі", "Sales")):
+    chat = _first(_CHAT_HEADER(parser))
+    chat_link = _first(_MEDIA_USER_NAME(chat)).find(".//a")
+    interlocutor_name = _TEXT(chat_link)
+    interlocutor_id = int(chat_link.get("href").rsplit("/", 2)[-2])
+    nav_bar = _first(_NAV_BAR(parser))
+    active_item = _first(_ACTIVE_ITEM(nav_bar))
+    if any(i in _TEXT(active_item.find(".//a")).strip() for i in ("Продажи", "Продажі", "Sales")):
         buyer_id, buyer_username = interlocutor_id, interlocutor_name
         seller_id, seller_username = account.id, account.username
     else:
@@ -587,22 +866,22 @@ def parse_order(html: str, account: Account, order_id: str) -> types.Order:
         seller_id, seller_username = interlocutor_id, interlocutor_name
     id1, id2 = sorted([buyer_id, seller_id])
     chat_id = f"users-{id1}-{id2}"
-    review_obj = parser.find("div", {"class": "order-review"})
-    if not (stars_obj := review_obj.find("div", {"class": "rating"})):
+    review_obj = _first(_ORDER_REVIEW(parser))
+    if (stars_obj := _first(_RATING(review_obj))) is None:
         stars, text = None, None
     else:
-        stars = int(stars_obj.find("div").get("class")[0].split("rating")[1])
-        text = review_obj.find("div", {"class": "review-item-text"}).text.strip()
-    hidden = review_obj.find("span", class_="text-warning") is not None
-    if not (reply_obj := review_obj.find("div", {"class": "review-item-answer review-compiled-reply"})):
+        stars = int(stars_obj.find(".//div").get("class").split()[0].split("rating")[1])
+        text = _TEXT(_first(_REVIEW_TEXT(review_obj))).strip()
+    hidden = _HAS_TEXT_WARNING(review_obj)
+    if (reply_obj := _first(_REVIEW_REPLY(review_obj))) is None:
         reply = None
     else:
-        reply = reply_obj.find("div").text.strip()
+        reply = _DIV_TEXT(reply_obj).strip()
 
     if all([not text, not reply]):
         review = None
     else:
-        review = types.Review(stars, text, reply, False, str(review_obj), hidden, order_id, buyer_username,
+        review = types.Review(stars, text, reply, False, _outer_html(review_obj), hidden, order_id, buyer_username,
                                 buyer_id, bool(text and text.endswith(account.bot_character)),
                                 bool(reply and reply.endswith(account.bot_character)))
     order = types.Order(order_id, status, subcategory, lot_params, buyer_params,
@@ -611,129 +890,229 @@ def parse_order(html: str, account: Account, order_id: str) -> types.Order:
                         html, review, order_secrets)
     return order
 
-def parse_sales(html: str, account: Account, include_paid: bool, include_closed: bool, include_refunded: bool, exclude_ids: list[str] | None = None, start_from: str | None = None) -> \
-            tuple[str | None, list[types.OrderShortcut], str, dict[str, types.SubCategory]]:
-    parser = BeautifulSoup(html, "lxml")
+class SalesParser:
+    """
+    Потоковый парсер страницы продаж.
+    Разбирает каждый заказ сразу после того, как он был получен, освобождая память от уже обработанных строк таблицы
+    (важно при пролистывании длинной истории продаж).
 
-    if not start_from:
-        username = parser.find("div", {"class": "user-link-name"})
-        if not username:
-            raise exceptions.funpay_apiError("Failed to parse an essential element (lot page). The page structure may have changed, or you may not be logged in.")
+    :param account: экземпляр аккаунта.
 
-    next_order_id = parser.find("input", {"type": "hidden", "name": "continue"})
-    next_order_id = next_order_id.get("value") if next_order_id else None
+    :param include_paid: включить ли в список заказы, ожидающие выполнения.
+    :type include_paid: :obj:`bool`
 
-    order_divs = parser.find_all("a", {"class": "tc-item"})
-    subcategories = {}
-    if not start_from:
-        app_data = json.loads(parser.find("body").get("data-app-data"))
-        locale = app_data.get("locale")
-        account.csrf_token = app_data.get("csrf-token") or account.csrf_token
-        games_options = parser.find("select", attrs={"name": "game"})
-        if games_options:
-            games_options = games_options.find_all(lambda x: x.name == "option" and x.get("value"))
-            for game_option in games_options:
-                game_name = game_option.text
-                sections_list = json.loads(game_option.get("data-data"))
-                for key, section_name in sections_list:
-                    section_type, section_id = key.split("-")
-                    section_type = types.SubCategoryTypes.COMMON if section_type == "lot" else types.SubCategoryTypes.CURRENCY
-                    section_id = int(section_id)
-                    subcategories[f"{game_name}, {section_name}"] = account.get_subcategory(section_type, section_id)
-    else:
-        locale = None
+    :param include_closed: включить ли в список закрытые заказы.
+    :type include_closed: :obj:`bool`
 
-    if not order_divs:
-        return None, [], locale, subcategories
+    :param include_refunded: включить ли в список заказы, за которые запрошен возврат средств.
+    :type include_refunded: :obj:`bool`
 
-    sales = []
-    for div in order_divs:
-        classname = div.get("class")
-        if "warning" in classname:
-            if not include_refunded:
+    :param exclude_ids: ID заказов, которые нужно исключить из списка.
+    :type exclude_ids: :obj:`list` of :obj:`str` or :obj:`None`
+
+    :param start_from: ID заказа, с которого начата страница (если страница не первая).
+    :type start_from: :obj:`str` or :obj:`None`
+    """
+
+    def __init__(self, account: Account, include_paid: bool, include_closed: bool, include_refunded: bool,
+                 exclude_ids: list[str] | None = None, start_from: str | None = None):
+        self._account = account
+        self._account_id = account.id
+        self._include_paid = include_paid
+        self._include_closed = include_closed
+        self._include_refunded = include_refunded
+        self._exclude_ids = exclude_ids
+        self._start_from = start_from
+        self._parser = etree.HTMLPullParser(events=("start", "end"), tag=("body", "div", "input", "select", "a"))
+        self._app_data: str | None = None
+        self._logged_in = False
+        self._next_order_id: str | None = None
+        self._has_orders = False
+        self._subcategories: dict[str, types.SubCategory] = {}
+        self._result: list[types.OrderShortcut] = []
+
+    def feed(self, data: bytes | str):
+        """
+        Передает парсеру очередную часть HTML страницы.
+
+        :param data: часть HTML страницы.
+        :type data: :obj:`bytes` or :obj:`str`
+        """
+        self._parser.feed(data)
+        self._handle_events()
+
+    def close(self) -> tuple[str | None, list[types.OrderShortcut], str | None, dict[str, types.SubCategory]]:
+        """
+        Завершает парсинг страницы.
+
+        :return: (ID следующего заказа (для следующего запроса), список заказов, локаль,
+            подкатегории заказов {"Название игры, Название подкатегории": объект подкатегории}).
+        :rtype: :obj:`tuple` (:obj:`str` or :obj:`None`, :obj:`list` of :class:`funpay_api.types.OrderShortcut`,
+            :obj:`str` or :obj:`None`, :obj:`dict` {:obj:`str`: :class:`funpay_api.types.SubCategory`})
+        """
+        self._parser.close()
+        self._handle_events()
+        if not self._start_from and not self._logged_in:
+            raise exceptions.funpay_apiError("Failed to parse an essential element (lot page). The page structure may have changed, or you may not be logged in.")
+
+        locale = None
+        if not self._start_from:
+            app_data = utils.json_loads(self._app_data)
+            locale = app_data.get("locale")
+            self._account.csrf_token = app_data.get("csrf-token") or self._account.csrf_token
+
+        if not self._has_orders:
+            return None, [], locale, self._subcategories
+
+        # Фильтр игр обычно идет до таблицы заказов, но подкатегории проставляются после разбора всей страницы,
+        # чтобы не зависеть от порядка блоков.
+        if self._subcategories:
+            for order in self._result:
+                order.subcategory = self._subcategories.get(order.subcategory_name)
+        return self._next_order_id, self._result, locale, self._subcategories
+
+    def _handle_events(self):
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if elem.tag == "body":
+                    self._app_data = elem.get("data-app-data")
                 continue
+            tag = elem.tag
+            if tag == "a":
+                classes = elem.get("class", "").split()
+                if "tc-item" not in classes:
+                    continue
+                self._has_orders = True
+                if (order := self._parse_order(elem, classes)) is not None:
+                    self._result.append(order)
+                elem.clear(keep_tail=True)
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+            elif tag == "div":
+                if not self._logged_in and "user-link-name" in elem.get("class", "").split():
+                    self._logged_in = True
+            elif tag == "input":
+                if elem.get("type") == "hidden" and elem.get("name") == "continue" and self._next_order_id is None:
+                    self._next_order_id = elem.get("value")
+            elif tag == "select":
+                if not self._start_from and elem.get("name") == "game" and not self._subcategories:
+                    self._parse_games(elem)
+
+    def _parse_games(self, games_select):
+        # Фильтр игр меняется редко (только при появлении продаж в новой игре или смене языка), поэтому словарь
+        # подкатегорий кэшируется на аккаунте по содержимому фильтра.
+        options = [(_TEXT(game_option), game_option.get("data-data")) for game_option in _GAME_OPTIONS(games_select)]
+        options_key = tuple(options)
+        cache = self._account._sales_subcategories_cache
+        if cache is not None and cache[0] == options_key:
+            self._subcategories = dict(cache[1])
+            return
+
+        for game_name, data in options:
+            sections_list = utils.json_loads(data)
+            for key, section_name in sections_list:
+                section_type, _, section_id = key.partition("-")
+                section_type = types.SubCategoryTypes.COMMON if section_type == "lot" else types.SubCategoryTypes.CURRENCY
+                section_id = int(section_id)
+                self._subcategories[f"{game_name}, {section_name}"] = self._account.get_subcategory(section_type,
+                                                                                                   section_id)
+        self._account._sales_subcategories_cache = (options_key, dict(self._subcategories))
+
+    def _parse_order(self, div, classname: list[str]) -> types.OrderShortcut | None:
+        if "warning" in classname:
+            if not self._include_refunded:
+                return None
             order_status = types.OrderStatuses.REFUNDED
         elif "info" in classname:
-            if not include_paid:
-                continue
+            if not self._include_paid:
+                return None
             order_status = types.OrderStatuses.PAID
         else:
-            if not include_closed:
-                continue
+            if not self._include_closed:
+                return None
             order_status = types.OrderStatuses.CLOSED
 
-        order_id = div.find("div", {"class": "tc-order"}).text[1:]
-        if exclude_ids and order_id in exclude_ids:
-            continue
+        fields = _find_first_by_classes(div, _ORDER_FIELD_TAGS)
+        order_id = _TEXT(fields.get("tc-order"))[1:]
+        if self._exclude_ids and order_id in self._exclude_ids:
+            return None
 
-        description = div.find("div", {"class": "order-desc"}).find("div").text
-        tc_price = div.find("div", {"class": "tc-price"}).text
-        price, currency = tc_price.rsplit(maxsplit=1)
-        price = float(price.replace(" ", ""))
-        currency = utils.parse_currency(currency)
+        description = _DIV_TEXT(fields.get("order-desc"))
+        tc_price = _TEXT(fields.get("tc-price"))
+        price, currency = utils.parse_price(tc_price)
 
-        buyer_div = div.find("div", {"class": "media-user-name"}).find("span")
-        buyer_username = buyer_div.text
-        buyer_id = int(buyer_div.get("data-href")[:-1].split("/users/")[1])
-        subcategory_name = div.find("div", {"class": "text-muted"}).text
-        subcategory = None
-        if subcategories:
-            subcategory = subcategories.get(subcategory_name)
+        buyer_div = fields.get("media-user-name").find(".//span")
+        buyer_username = _TEXT(buyer_div)
+        buyer_id = int(buyer_div.get("data-href").partition("/users/")[2][:-1])
+        subcategory_name = _TEXT(fields.get("text-muted"))
 
+        order_date_text = _TEXT(fields.get("tc-date-time"))
+        if (date_match := _ORDER_DATE_RE.match(order_date_text)) is None:
+            raise ValueError(f"Не удалось распарсить дату заказа: {order_date_text!r}")
+        today, yesterday, day, month, year, h, m = date_match.groups()
         now = datetime.now()
-        order_date_text = div.find("div", {"class": "tc-date-time"}).text
-        if any(today in order_date_text for today in ("сегодня", "сьогодні", "today")):  # сегодня, ЧЧ:ММ
-            h, m = order_date_text.split(", ")[1].split(":")
+        if today:  # сегодня, ЧЧ:ММ
             order_date = datetime(now.year, now.month, now.day, int(h), int(m))
-        elif any(yesterday in order_date_text for yesterday in ("вчера", "вчора", "yesterday")):  # вчера, ЧЧ:ММ
-            h, m = order_date_text.split(", ")[1].split(":")
+        elif yesterday:  # вчера, ЧЧ:ММ
             temp = now - timedelta(days=1)
             order_date = datetime(temp.year, temp.month, temp.day, int(h), int(m))
-        elif order_date_text.count(" ") == 2:  # ДД месяца, ЧЧ:ММ
-            split = order_date_text.split(", ")
-            day, month = split[0].split()
-            day, month = int(day), utils.MONTHS[month]
-            h, m = split[1].split(":")
-            order_date = datetime(now.year, month, day, int(h), int(m))
-        else:  # ДД месяца ГГГГ, ЧЧ:ММ
-            split = order_date_text.split(", ")
-            day, month, year = split[0].split()
-            day, month, year = int(day), utils.MONTHS[month], int(year)
-            h, m = split[1].split(":")
-            order_date = datetime(year, month, day, int(h), int(m))
-        id1, id2 = sorted([buyer_id, account.id])
-        chat_id = f"users-{id1}-{id2}"
-        order_obj = types.OrderShortcut(order_id, description, price, currency, buyer_username, buyer_id, chat_id,
-                                        order_status, order_date, subcategory_name, subcategory, str(div))
-        sales.append(order_obj)
-
-    return next_order_id, sales, locale, subcategories
+        else:  # ДД месяца[ ГГГГ], ЧЧ:ММ
+            order_date = datetime(int(year) if year else now.year, utils.MONTHS[month], int(day), int(h), int(m))
+        account_id = self._account_id
+        chat_id = f"users-{buyer_id}-{account_id}" if buyer_id < account_id else f"users-{account_id}-{buyer_id}"
+        return types.OrderShortcut(order_id, description, price, currency, buyer_username, buyer_id, chat_id,
+                                   order_status, order_date, subcategory_name, None, _outer_html(div))
+
+
+def parse_sales(html: str | bytes, account: Account, include_paid: bool, include_closed: bool, include_refunded: bool,
+                exclude_ids: list[str] | None = None, start_from: str | None = None) -> \
+            tuple[str | None, list[types.OrderShortcut], str | None, dict[str, types.SubCategory]]:
+    if not start_from:
+        _check_logged_in(html, "lot page")
+    parser = SalesParser(account, include_paid, include_closed, include_refunded, exclude_ids, start_from)
+    parser.feed(html)
+    return parser.close()
 
 def parse_chats(html: str, account: Account) -> list[types.ChatShortcut]:
-    parser = BeautifulSoup(html, "lxml")
-    chats = parser.find_all("a", {"class": "contact-item"})
-    chats_objs = []
+    return list(iter_chats(html, account))
+
+def iter_chats(html: str, account: Account) -> Iterator[types.ChatShortcut]:
+    """
+    Лениво создает объекты чатов из HTML списка чатов (в порядке их следования на странице).
+    Подходит для случаев, когда нужен только первый подходящий чат: объекты остальных чатов не создаются.
+
+    :param html: HTML список чатов.
+    :type html: :obj:`str`
+
+    :param account: экземпляр аккаунта.
+
+    :return: генератор объектов чатов.
+    :rtype: :obj:`Iterator` of :class:`funpay_api.types.ChatShortcut`
+    """
+    parser = _parse_html(html)
+    chats = _CONTACT_ITEMS(parser)
+    bot_character, old_bot_character = account.bot_character, account.old_bot_character
 
     for msg in chats:
-        chat_id = int(msg["data-id"])
-        last_msg_text = msg.find("div", {"class": "contact-item-message"}).text
-        unread = True if "unread" in msg.get("class") else False
-        chat_with = msg.find("div", {"class": "media-user-name"}).text
+        chat_id = int(msg.get("data-id"))
+        last_msg_text = _TEXT(_first(_CONTACT_ITEM_MESSAGE(msg)))
+        unread = "unread" in (msg.get("class") or "").split()
+        chat_with = _TEXT(_first(_MEDIA_USER_NAME(msg)))
         node_msg_id = int(msg.get('data-node-msg'))
         user_msg_id = int(msg.get('data-user-msg'))
         by_bot = False
         by_vertex = False
         is_image = last_msg_text in ("Изображение", "Зображення", "Image")
-        if last_msg_text.startswith(account.bot_character):
+        if last_msg_text.startswith(bot_character):
             last_msg_text = last_msg_text[1:]
             by_bot = True
-        elif last_msg_text.startswith(account.old_bot_character):
+        elif last_msg_text.startswith(old_bot_character):
             last_msg_text = last_msg_text[1:]
             by_vertex = True
-        chat_obj = types.ChatShortcut(chat_id, chat_with, last_msg_text, node_msg_id, user_msg_id, unread, str(msg))
+        chat_obj = types.ChatShortcut(chat_id, chat_with, last_msg_text, node_msg_id, user_msg_id, unread,
+                                      partial(_outer_html, msg))
         if not is_image:
             chat_obj.last_by_bot = by_bot
             chat_obj.last_by_vertex = by_vertex
 
-        chats_objs.append(chat_obj)
-    return chats_objs
+        yield chat_obj
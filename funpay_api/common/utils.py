@@ -5,8 +5,14 @@
 import string
 import random
 import re
+import json
 from .enums import Currency
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 MONTHS = {
     "января": 1,
     "февраля": 2,
@@ -46,6 +52,56 @@ MONTHS = {
     "December": 12
 }
 
+# Общие заголовки запросов к FunPay. Клиент их не изменяет (объединяет с базовыми в новый словарь),
+# поэтому одни и те же словари передаются во все запросы; изменять их нельзя.
+ACCEPT_HEADERS = {"accept": "*/*"}
+XHR_HEADERS = {
+    "accept": "*/*",
+    "x-requested-with": "XMLHttpRequest"
+}
+FORM_XHR_HEADERS = {
+    "accept": "*/*",
+    "content-type": "application/x-www-form-urlencoded; charset=UTF-8",
+    "x-requested-with": "XMLHttpRequest"
+}
+
+
+def json_dumps(obj) -> str:
+    """
+    Сериализует объект в JSON-строку (через orjson, если он установлен).
+
+    :param obj: объект для сериализации.
+
+    :return: JSON-строка.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def json_loads(data):
+    """
+    Десериализует JSON-строку (через orjson, если он установлен).
+
+    :param data: JSON-строка или байты.
+
+    :return: десериализованный объект.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def xpath_class(class_name: str) -> str:
+    """
+    Генерирует XPath-условие на наличие класса у элемента (аналог CSS-селектора `.class_name`).
+
+    :param class_name: название класса.
+
+    :return: XPath-условие.
+    """
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
 
 def random_tag() -> str:
     """
@@ -64,7 +120,7 @@ def parse_wait_time(response: str) -> int:
 
     :return: Примерное время ожидание до следующего поднятия лотов (в секундах).
     """
-    x = "".join([i for i in response if i.isdigit()])
+    x = _NON_DIGITS_RE.sub("", response)
     if "секунд" in response or "second" in response:
         return int(x) if x else 2
     elif "минут" in response or "хвилин" in response or "minute" in response:
@@ -75,11 +131,53 @@ def parse_wait_time(response: str) -> int:
         return 10
 
 
+_CURRENCIES = {"₽": Currency.RUB,
+               "€": Currency.EUR,
+               "$": Currency.USD,
+               "¤": Currency.RUB}
+
+
 def parse_currency(s: str) -> Currency:
-    return {"₽": Currency.RUB,
-            "€": Currency.EUR,
-            "$": Currency.USD,
-            "¤": Currency.RUB}.get(s, Currency.UNKNOWN)
+    return _CURRENCIES.get(s, Currency.UNKNOWN)
+
+
+_NON_DIGITS_RE = re.compile(r"\D+")
+_STRIP_SPACES = str.maketrans("", "", " \xa0\u202f")
+
+
+def _strip_spaces(s: str) -> str:
+    """
+    Удаляет из строки пробелы, в т.ч. неразрывные (разделители разрядов в ценах и количествах).
+    """
+    s = s.replace(" ", "")
+    # translate с таблицей заметно медленнее replace, а неразрывные пробелы встречаются редко.
+    return s if s.isascii() else s.translate(_STRIP_SPACES)
+
+
+def parse_price(s: str) -> tuple[float, Currency]:
+    """
+    Парсит строку с ценой и валютой (например, `1 234.56 ₽`).
+
+    :param s: строка с ценой.
+
+    :return: цена и валюта.
+    """
+    parts = s.rsplit(maxsplit=1)
+    if len(parts) != 2:
+        raise ValueError(f"Не удалось распарсить цену: {s!r}")
+    return float(_strip_spaces(parts[0])), parse_currency(parts[1])
+
+
+def parse_amount(s: str) -> int | None:
+    """
+    Парсит строку с количеством товара (например, `1 000`).
+
+    :param s: строка с количеством.
+
+    :return: количество или :obj:`None`, если строка не является числом.
+    """
+    s = _strip_spaces(s)
+    return int(s) if s.isdigit() else None
 
 
 class RegularExpressions(object):
@@ -94,135 +192,134 @@ class RegularExpressions(object):
             setattr(cls, "instance", super(RegularExpressions, cls).__new__(cls))
         return getattr(cls, "instance")
 
-    def __init__(self):
-        self.ORDER_PURCHASED = \
-            re.compile(r"(Покупатель|The buyer) [a-zA-Z0-9]+ (оплатил заказ|has paid for order) #[A-Z0-9]{8}\.")
-        """
-        Скомпилированное регулярное выражение, описывающее сообщение об оплате заказа.
-        Лучше всего использовать вместе с MessageTypesRes.ORDER_PURCHASED2
-        """
-
-        self.ORDER_PURCHASED2 = re.compile(
-            r"[a-zA-Z0-9]+, (не забудьте потом нажать кнопку («Подтвердить выполнение заказа»|«Подтвердить получение валюты»)\.|do not forget to press the («Confirm order fulfilment»|«Confirm currency receipt») button once you finish\.)")
-        """
-        Скомпилированное регулярное выражение, описывающее сообщение об оплате заказа (2).
-        Лучше всего использовать вместе с MessageTypesRes.ORDER_PURCHASED
-        """
-
-        self.ORDER_CONFIRMED = re.compile(
-            r"(Покупатель|The buyer) [a-zA-Z0-9]+ (подтвердил успешное выполнение заказа|has confirmed that order) #[A-Z0-9]{8} (и отправил деньги продавцу|has been fulfilled successfully and that the seller) [a-zA-Z0-9]+( has been paid)?\.")
-        """
-        Скомпилированное регулярное выражение, описывающее сообщение о подтверждении выполнения заказа.
-        """
-
-        self.NEW_FEEDBACK = re.compile(
-            r"(Покупатель|The buyer) [a-zA-Z0-9]+ (написал отзыв к заказу|has given feedback to the order) #[A-Z0-9]{8}\."
-        )
-        """
-        Скомпилированное регулярное выражение, описывающее сообщение о новом отзыве.
-        """
-
-        self.FEEDBACK_CHANGED = re.compile(
-            r"(Покупатель|The buyer) [a-zA-Z0-9]+ (изменил отзыв к заказу|has edited their feedback to the order) #[A-Z0-9]{8}\."
-        )
-
-        """
-        Скомпилированное регулярное выражение, описывающее сообщение об изменении отзыва.
-        """
-
-        self.FEEDBACK_DELETED = re.compile(
-            r"(Покупатель|The buyer) [a-zA-Z0-9]+ (удалил отзыв к заказу|has deleted their feedback to the order) #[A-Z0-9]{8}\.")
-        """
-        Скомпилированное регулярное выражение, описывающее сообщение об удалении отзыва.
-        """
-
-        self.NEW_FEEDBACK_ANSWER = re.compile(
-            r"(Продавец|The seller) [a-zA-Z0-9]+ (ответил на отзыв к заказу|has replied to their feedback to the order) #[A-Z0-9]{8}\."
-        )
-
-        """
-        Скомпилированное регулярное выражение, описывающее сообщение о новом ответе на отзыв.
-        """
-
-        self.FEEDBACK_ANSWER_CHANGED = re.compile(
-            r"(Продавец|The seller) [a-zA-Z0-9]+ (изменил ответ на отзыв к заказу|has edited a reply to their feedback to the order) #[A-Z0-9]{8}\."
-        )
-        """
-        Скомпилированное регулярное выражение, описывающее сообщение об изменении ответа на отзыв.
-        """
-
-        self.FEEDBACK_ANSWER_DELETED = re.compile(
-            r"(Продавец|The seller) [a-zA-Z0-9]+ (удалил ответ на отзыв к заказу|has deleted a reply to their feedback to the order) #[A-Z0-9]{8}\."
-        )
-        """
-        Скомпилированное регулярное выражение, описывающее сообщение об удалении ответа на отзыв.
-        """
-
-        self.ORDER_REOPENED = re.compile(
-            r"(Заказ|Order) #[A-Z0-9]{8} (открыт повторно|has been reopened)\."
-        )
-
-        """
-        Скомпилированное регулярное выражение, описывающее сообщение о повтором открытии заказа.
-        """
-
-        self.REFUND = re.compile(
-            r"(Продавец|The seller) [a-zA-Z0-9]+ (вернул деньги покупателю|has refunded the buyer) [a-zA-Z0-9]+ (по заказу|on order) #[A-Z0-9]{8}\."
-        )
-
-        """
-        Скомпилированное регулярное выражение, описывающее сообщение о возврате денежных средств.
-        """
-
-        self.REFUND_BY_ADMIN = re.compile(
-            r"(Администратор|The administrator) [a-zA-Z0-9]+ (вернул деньги покупателю|has refunded the buyer) [a-zA-Z0-9]+ (по заказу|on order) #[A-Z0-9]{8}\."
-        )
-        """
-        Скомпилированное регулярное выражение, описывающее сообщение о возврате денежных средств администратором.
-        """
-
-        self.PARTIAL_REFUND = re.compile(
-            r"(Часть средств по заказу|A part of the funds pertaining to the order) #[A-Z0-9]{8} (возвращена покупателю|has been refunded)\."
-        )
-
-        """
-        Скомпилированное регулярное выражение, описывающее сообщение частичном о возврате денежных средств.
-        """
-
-        self.ORDER_CONFIRMED_BY_ADMIN = re.compile(
-            r"(Администратор|The administrator) [a-zA-Z0-9]+ (подтвердил успешное выполнение заказа|has confirmed that order) #[A-Z0-9]{8} (и отправил деньги продавцу|has been fulfilled successfully and that the seller) [a-zA-Z0-9]+( has been paid)?\.")
-        """
-        Скомпилированное регулярное выражение, описывающее сообщение о подтверждении выполнения заказа администратором.
-        """
-
-        self.ORDER_ID = re.compile(r"#[A-Z0-9]{8}")
-        """
-        Скомпилированное регулярное выражение, описывающее ID заказа.
-        """
-
-        self.DISCORD = re.compile(
-            r"(You can switch to|Вы можете перейти в) Discord\. (However, note that friending someone is considered a violation rules|Внимание: общение за пределами сервера FunPay считается нарушением правил)\.")
-        """
-        Скомпилированное регулярное выражение о предложении перехода в Discord.
-        """
-        self.DEAR_VENDORS = re.compile(
-            r"(Уважаемые продавцы|Dear vendors), (не доверяйте сообщениям в чате|do not rely on chat messages)! (Перед выполнением заказа всегда проверяйте наличие оплаты в разделе «Мои продажи»|Before you process an order, you should always check whether you've been paid in «My sales» section)\.")
-        """
-        Скомпилированное регулярное выражение первого сообщения FunPay.
-        """
-
-        self.PRODUCTS_AMOUNT = re.compile(r",\s(\d{1,3}(?:\s?\d{3})*)\s(шт|pcs)\.")
-        """
-        Скомпилированное регулярное выражение, описывающее запись кол-ва товаров в заказе со страницы заказОВ.
-        """
-
-        self.PRODUCTS_AMOUNT_ORDER = re.compile(r"(\d{1,3}(?:\s?\d{3})*)\s(шт|pcs)\.")
-        """
-        Скомпилированное регулярное выражение, описывающее запись кол-ва товаров со страницы заказА.
-        """
-
-        self.EXCHANGE_RATE = re.compile(
-            r"(You will receive payment in|Вы начнёте получать оплату в|Ви почнете одержувати оплату в)\s*(USD|RUB|EUR)\.\s*(Your offers prices will be calculated based on the exchange rate:|Цены ваших предложений будут пересчитаны по курсу|Ціни ваших пропозицій будуть перераховані за курсом)\s*([\d.,]+)\s*(₽|€|\$)\s*(за|for)\s*([\d.,]+)\s*(₽|€|\$)\.")
-        """
-        Скомпилированное регулярное выражение, описывающее фразу о смене валюты.
-        """
+    ORDER_PURCHASED = \
+        re.compile(r"(Покупатель|The buyer) [a-zA-Z0-9]+ (оплатил заказ|has paid for order) #[A-Z0-9]{8}\.")
+    """
+    Скомпилированное регулярное выражение, описывающее сообщение об оплате заказа.
+    Лучше всего использовать вместе с MessageTypesRes.ORDER_PURCHASED2
+    """
+
+    ORDER_PURCHASED2 = re.compile(
+        r"[a-zA-Z0-9]+, (не забудьте потом нажать кнопку («Подтвердить выполнение заказа»|«Подтвердить получение валюты»)\.|do not forget to press the («Confirm order fulfilment»|«Confirm currency receipt») button once you finish\.)")
+    """
+    Скомпилированное регулярное выражение, описывающее сообщение об оплате заказа (2).
+    Лучше всего использовать вместе с MessageTypesRes.ORDER_PURCHASED
+    """
+
+    ORDER_CONFIRMED = re.compile(
+        r"(Покупатель|The buyer) [a-zA-Z0-9]+ (подтвердил успешное выполнение заказа|has confirmed that order) #[A-Z0-9]{8} (и отправил деньги продавцу|has been fulfilled successfully and that the seller) [a-zA-Z0-9]+( has been paid)?\.")
+    """
+    Скомпилированное регулярное выражение, описывающее сообщение о подтверждении выполнения заказа.
+    """
+
+    NEW_FEEDBACK = re.compile(
+        r"(Покупатель|The buyer) [a-zA-Z0-9]+ (написал отзыв к заказу|has given feedback to the order) #[A-Z0-9]{8}\."
+    )
+    """
+    Скомпилированное регулярное выражение, описывающее сообщение о новом отзыве.
+    """
+
+    FEEDBACK_CHANGED = re.compile(
+        r"(Покупатель|The buyer) [a-zA-Z0-9]+ (изменил отзыв к заказу|has edited their feedback to the order) #[A-Z0-9]{8}\."
+    )
+
+    """
+    Скомпилированное регулярное выражение, описывающее сообщение об изменении отзыва.
+    """
+
+    FEEDBACK_DELETED = re.compile(
+        r"(Покупатель|The buyer) [a-zA-Z0-9]+ (удалил отзыв к заказу|has deleted their feedback to the order) #[A-Z0-9]{8}\.")
+    """
+    Скомпилированное регулярное выражение, описывающее сообщение об удалении отзыва.
+    """
+
+    NEW_FEEDBACK_ANSWER = re.compile(
+        r"(Продавец|The seller) [a-zA-Z0-9]+ (ответил на отзыв к заказу|has replied to their feedback to the order) #[A-Z0-9]{8}\."
+    )
+
+    """
+    Скомпилированное регулярное выражение, описывающее сообщение о новом ответе на отзыв.
+    """
+
+    FEEDBACK_ANSWER_CHANGED = re.compile(
+        r"(Продавец|The seller) [a-zA-Z0-9]+ (изменил ответ на отзыв к заказу|has edited a reply to their feedback to the order) #[A-Z0-9]{8}\."
+    )
+    """
+    Скомпилированное регулярное выражение, описывающее сообщение об изменении ответа на отзыв.
+    """
+
+    FEEDBACK_ANSWER_DELETED = re.compile(
+        r"(Продавец|The seller) [a-zA-Z0-9]+ (удалил ответ на отзыв к заказу|has deleted a reply to their feedback to the order) #[A-Z0-9]{8}\."
+    )
+    """
+    Скомпилированное регулярное выражение, описывающее сообщение об удалении ответа на отзыв.
+    """
+
+    ORDER_REOPENED = re.compile(
+        r"(Заказ|Order) #[A-Z0-9]{8} (открыт повторно|has been reopened)\."
+    )
+
+    """
+    Скомпилированное регулярное выражение, описывающее сообщение о повтором открытии заказа.
+    """
+
+    REFUND = re.compile(
+        r"(Продавец|The seller) [a-zA-Z0-9]+ (вернул деньги покупателю|has refunded the buyer) [a-zA-Z0-9]+ (по заказу|on order) #[A-Z0-9]{8}\."
+    )
+
+    """
+    Скомпилированное регулярное выражение, описывающее сообщение о возврате денежных средств.
+    """
+
+    REFUND_BY_ADMIN = re.compile(
+        r"(Администратор|The administrator) [a-zA-Z0-9]+ (вернул деньги покупателю|has refunded the buyer) [a-zA-Z0-9]+ (по заказу|on order) #[A-Z0-9]{8}\."
+    )
+    """
+    Скомпилированное регулярное выражение, описывающее сообщение о возврате денежных средств администратором.
+    """
+
+    PARTIAL_REFUND = re.compile(
+        r"(Часть средств по заказу|A part of the funds pertaining to the order) #[A-Z0-9]{8} (возвращена покупателю|has been refunded)\."
+    )
+
+    """
+    Скомпилированное регулярное выражение, описывающее сообщение частичном о возврате денежных средств.
+    """
+
+    ORDER_CONFIRMED_BY_ADMIN = re.compile(
+        r"(Администратор|The administrator) [a-zA-Z0-9]+ (подтвердил успешное выполнение заказа|has confirmed that order) #[A-Z0-9]{8} (и отправил деньги продавцу|has been fulfilled successfully and that the seller) [a-zA-Z0-9]+( has been paid)?\.")
+    """
+    Скомпилированное регулярное выражение, описывающее сообщение о подтверждении выполнения заказа администратором.
+    """
+
+    ORDER_ID = re.compile(r"#[A-Z0-9]{8}")
+    """
+    Скомпилированное регулярное выражение, описывающее ID заказа.
+    """
+
+    DISCORD = re.compile(
+        r"(You can switch to|Вы можете перейти в) Discord\. (However, note that friending someone is considered a violation rules|Внимание: общение за пределами сервера FunPay считается нарушением правил)\.")
+    """
+    Скомпилированное регулярное выражение о предложении перехода в Discord.
+    """
+    DEAR_VENDORS = re.compile(
+        r"(Уважаемые продавцы|Dear vendors), (не доверяйте сообщениям в чате|do not rely on chat messages)! (Перед выполнением заказа всегда проверяйте наличие оплаты в разделе «Мои продажи»|Before you process an order, you should always check whether you've been paid in «My sales» section)\.")
+    """
+    Скомпилированное регулярное выражение первого сообщения FunPay.
+    """
+
+    PRODUCTS_AMOUNT = re.compile(r",\s(\d{1,3}(?:\s?\d{3})*)\s(шт|pcs)\.")
+    """
+    Скомпилированное регулярное выражение, описывающее запись кол-ва товаров в заказе со страницы заказОВ.
+    """
+
+    PRODUCTS_AMOUNT_ORDER = re.compile(r"(\d{1,3}(?:\s?\d{3})*)\s(шт|pcs)\.")
+    """
+    Скомпилированное регулярное выражение, описывающее запись кол-ва товаров со страницы заказА.
+    """
+
+    EXCHANGE_RATE = re.compile(
+        r"(You will receive payment in|Вы начнёте получать оплату в|Ви почнете одержувати оплату в)\s*(USD|RUB|EUR)\.\s*(Your offers prices will be calculated based on the exchange rate:|Цены ваших предложений будут пересчитаны по курсу|Ціни ваших пропозицій будуть перераховані за курсом)\s*([\d.,]+)\s*(₽|€|\$)\s*(за|for)\s*([\d.,]+)\s*(₽|€|\$)\.")
+    """
+    Скомпилированное регулярное выражение, описывающее фразу о смене валюты.
+    """
@@ -1,4 +1,5 @@
 import asyncio
+import threading
 from typing import Literal, Optional, List, Dict, Tuple, IO
 
 from .async_account import AsyncAccount
@@ -7,7 +8,8 @@ from . import types
 class SyncAccount:
     """
     Предоставляет синхронный интерфейс для взаимодействия с FunPay.
-    Является оболочкой над :class:`AsyncAccount`, запуская асинхронные методы в новом event loop.
+    Является оболочкой над :class:`AsyncAccount`, запуская асинхронные методы в собственном event loop, который
+    работает в отдельном фоновом потоке и переиспользуется между вызовами (сохраняя keep-alive соединения клиента).
     """
     def __init__(self, golden_key: str, user_agent: str | None = None,
                  requests_timeout: int | float = 10, proxy: Optional[dict] = None,
@@ -15,14 +17,43 @@ class SyncAccount:
 
         # SyncAccount содержит экземпляр AsyncAccount и делегирует ему вызовы.
         self._async_account = AsyncAccount(golden_key, user_agent, requests_timeout, proxy, locale)
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._run_loop, args=(self._loop,), name="SyncAccountLoop",
+                                             daemon=True)
+        self._loop_thread.start()
 
     def __getattr__(self, name):
         # Делегируем доступ к атрибутам (напр. self.id, self.username)
         return getattr(self._async_account, name)
 
+    def __del__(self):
+        # __init__ мог не дойти до создания loop'а, а __getattr__ делегирует AsyncAccount, поэтому смотрим в __dict__.
+        if self.__dict__.get("_loop") is not None:
+            self.close()
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        # Loop закрывается в своем же потоке, после остановки, поэтому close() можно вызвать и из этого потока.
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
     def _run_async(self, coro):
         # Вспомогательный метод для синхронного запуска корутин.
-        return asyncio.run(coro)
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def close(self) -> None:
+        """
+        Останавливает фоновый event loop. После вызова методы аккаунта использовать нельзя.
+        """
+        if self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        # Из потока loop'а (напр. из колбэка или __del__ при сборке мусора в нем) только планируем остановку:
+        # работающий loop закрыть нельзя, он закроется сам после выхода из run_forever().
+        if self._loop_thread is not threading.current_thread():
+            self._loop_thread.join()
 
     # Обертки для всех публичных асинхронных методов
     def get(self, update_phpsessid: bool = True) -> "SyncAccount":
@@ -62,6 +93,9 @@ class SyncAccount:
     def raise_lots(self, *args, **kwargs) -> bool:
         return self._run_async(self._async_account.raise_lots(*args, **kwargs))
 
+    def raise_categories(self, *args, **kwargs) -> Dict[int, bool | Exception]:
+        return self._run_async(self._async_account.raise_categories(*args, **kwargs))
+
     def get_chat_history(self, *args, **kwargs) -> List[types.Message]:
         return self._run_async(self._async_account.get_chat_history(*args, **kwargs))
 
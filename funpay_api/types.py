@@ -4,13 +4,23 @@
 from __future__ import annotations
 
 import re
-from typing import Literal, overload, Optional
+from typing import Callable, Literal, overload, Optional
 
 import funpay_api.common.enums
 from .common.utils import RegularExpressions
 from .common.enums import MessageTypes, OrderStatuses, SubCategoryTypes, Currency
 import datetime
 
+_FAKE_MESSAGE_HTML = """
+            <div class="chat-msg-item" id="message-0000000000">
+                <div class="chat-message">
+                    <div class="chat-msg-body">
+                        <div class="chat-msg-text">{text}</div>
+                    </div>
+                </div>
+            </div>
+            """
+
 
 class BaseOrderInfo:
     """
@@ -42,15 +52,15 @@ class ChatShortcut(BaseOrderInfo):
     :param unread: флаг "непрочитанности" (`True`, если чат не прочитан (оранжевый). `False`, если чат прочитан).
     :type unread: :obj:`bool`
 
-    :param html: HTML код виджета чата.
-    :type html: :obj:`str`
+    :param html: HTML код виджета чата (или функция, возвращающая его; будет вызвана при первом обращении).
+    :type html: :obj:`str` or :obj:`Callable`
 
     :param determine_msg_type: определять ли тип последнего сообщения?
     :type determine_msg_type: :obj:`bool`, опционально
     """
 
     def __init__(self, id_: int, name: str, last_message_text: str, node_msg_id: int, user_msg_id: int,
-                 unread: bool, html: str, determine_msg_type: bool = True):
+                 unread: bool, html: str | Callable[[], str], determine_msg_type: bool = True):
         self.id: int = id_
         """ID чата."""
         self.name: str | None = name if name else None
@@ -69,10 +79,20 @@ class ChatShortcut(BaseOrderInfo):
         """ID последнего прочитанного сообщения."""
         self.last_message_type: MessageTypes | None = None if not determine_msg_type else self.get_last_message_type()
         """Тип последнего сообщения."""
-        self.html: str = html
-        """HTML код виджета чата."""
+        self._html: str | Callable[[], str] = html
         BaseOrderInfo.__init__(self)
 
+    @property
+    def html(self) -> str:
+        """HTML код виджета чата."""
+        if callable(self._html):
+            self._html = self._html()
+        return self._html
+
+    @html.setter
+    def html(self, value: str | Callable[[], str]):
+        self._html = value
+
     def get_last_message_type(self) -> MessageTypes:
         """
         Определяет тип последнего сообщения в чате на основе регулярных выражений из MessageTypesRes.
@@ -205,8 +225,8 @@ class Message(BaseOrderInfo):
     :param author_id: ID автора сообщения.
     :type author_id: :obj:`int`
 
-    :param html: HTML код сообщения.
-    :type html: :obj:`str`
+    :param html: HTML код сообщения. Если не передан, генерируется из текста при первом обращении.
+    :type html: :obj:`str` or :obj:`None`
 
     :param image_link: ссылка на изображение из сообщения (если есть).
     :type image_link: :obj:`str` or :obj:`None`, опционально
@@ -217,7 +237,7 @@ class Message(BaseOrderInfo):
 
     def __init__(self, id_: int, text: str | None, chat_id: int | str, chat_name: str | None,
                  interlocutor_id: int | None,
-                 author: str | None, author_id: int, html: str,
+                 author: str | None, author_id: int, html: str | None,
                  image_link: str | None = None, image_name: str | None = None,
                  determine_msg_type: bool = True, badge_text: Optional[str] = None):
         self.id: int = id_
@@ -238,8 +258,7 @@ class Message(BaseOrderInfo):
         """Автор сообщения."""
         self.author_id: int = author_id
         """ID автора сообщения."""
-        self.html: str = html
-        """HTML-код сообщения."""
+        self._html: str | None = html
         self.image_link: str | None = image_link
         """Ссылка на изображение в сообщении (если оно есть)."""
         self.image_name: str | None = image_name
@@ -271,6 +290,17 @@ class Message(BaseOrderInfo):
 
         BaseOrderInfo.__init__(self)
 
+    @property
+    def html(self) -> str:
+        """HTML-код сообщения."""
+        if self._html is None:
+            self._html = _FAKE_MESSAGE_HTML.format(text=self.text)
+        return self._html
+
+    @html.setter
+    def html(self, value: str | None):
+        self._html = value
+
     def get_message_type(self) -> MessageTypes:
         """
         Определяет тип сообщения на основе регулярных выражений из MessageTypesRes.
@@ -683,6 +713,10 @@ class LotFields:
     :param currency: валюта лота.
     :type currency: :class:`funpay_api.common.enums.Currency`
     """
+    __slots__ = ("lot_id", "__fields", "title_ru", "title_en", "description_ru", "description_en", "payment_msg_ru",
+                 "payment_msg_en", "images", "auto_delivery", "secrets", "amount", "price", "active",
+                 "deactivate_after_sale", "subcategory", "public_link", "private_link", "currency", "csrf_token",
+                 "calc_result")
 
     def __init__(self, lot_id: int, fields: dict, subcategory: SubCategory | None = None,
                  currency: Currency = Currency.UNKNOWN, calc_result: CalcResult | None = None):
@@ -786,6 +820,8 @@ class LotFields:
 
 
 class ChipOffer:
+    __slots__ = ("lot_id", "active", "server", "side", "price", "amount")
+
     def __init__(self, lot_id: str, active: bool = False, server: str | None = None,
                  side: str | None = None, price: float | None = None, amount: int | None = None):
         self.lot_id = lot_id
@@ -802,6 +838,8 @@ class ChipOffer:
 
 
 class ChipFields:
+    __slots__ = ("subcategory_id", "__fields", "min_sum", "account_id", "game_id", "csrf_token", "chip_offers")
+
     def __init__(self, account_id: int, subcategory_id: int, fields: dict[str, str]):
         self.subcategory_id = subcategory_id
         self.__fields = fields
@@ -965,15 +1003,15 @@ class LotShortcut:
     :param subcategory: подкатегория лота.
     :type subcategory: :class:`funpay_api.types.SubCategory`
 
-    :param html: HTML код виджета лота.
-    :type html: :obj:`str`
+    :param html: HTML код виджета лота (или функция, возвращающая его; будет вызвана при первом обращении).
+    :type html: :obj:`str` or :obj:`Callable`
     """
 
     def __init__(self, id_: int | str, server: str | None,
                  description: str | None, amount: int | None, price: float, currency: Currency,
                  subcategory: SubCategory | None,
                  seller: SellerShortcut | None, auto: bool, promo: bool | None, attributes: dict[str, int | str] | None,
-                 html: str):
+                 html: str | Callable[[], str]):
         self.id: int | str = id_
         if isinstance(self.id, str) and self.id.isnumeric():
             self.id = int(self.id)
@@ -1000,12 +1038,22 @@ class LotShortcut:
         """Атрибуты лота (только для лотов из таблицы)"""
         self.subcategory: SubCategory = subcategory
         """Подкатегория лота."""
-        self.html: str = html
-        """HTML-код виджета лота."""
+        self._html: str | Callable[[], str] = html
         self.public_link: str = f"https://funpay.com/chips/offer?id={self.id}" \
             if self.subcategory.type is SubCategoryTypes.CURRENCY else f"https://funpay.com/lots/offer?id={self.id}"
         """Публичная ссылка на лот."""
 
+    @property
+    def html(self) -> str:
+        """HTML-код виджета лота."""
+        if callable(self._html):
+            self._html = self._html()
+        return self._html
+
+    @html.setter
+    def html(self, value: str | Callable[[], str]):
+        self._html = value
+
 
 class MyLotShortcut:
     """
@@ -1029,14 +1077,14 @@ class MyLotShortcut:
     :param subcategory: подкатегория лота.
     :type subcategory: :class:`funpay_api.types.SubCategory`
 
-    :param html: HTML код виджета лота.
-    :type html: :obj:`str`
+    :param html: HTML код виджета лота (или функция, возвращающая его; будет вызвана при первом обращении).
+    :type html: :obj:`str` or :obj:`Callable`
     """
 
     def __init__(self, id_: int | str, server: str | None,
                  description: str | None, amount: int | None, price: float, currency: Currency,
                  subcategory: SubCategory | None, auto: bool, active: bool,
-                 html: str):
+                 html: str | Callable[[], str]):
         self.id: int | str = id_
         if isinstance(self.id, str) and self.id.isnumeric():
             self.id = int(self.id)
@@ -1059,12 +1107,22 @@ class MyLotShortcut:
         """Подкатегория лота."""
         self.active: bool = active
         """Активен ли лот?"""
-        self.html: str = html
-        """HTML-код виджета лота."""
+        self._html: str | Callable[[], str] = html
         self.public_link: str = f"https://funpay.com/chips/offer?id={self.id}" \
             if self.subcategory.type is SubCategoryTypes.CURRENCY else f"https://funpay.com/lots/offer?id={self.id}"
         """Публичная ссылка на лот."""
 
+    @property
+    def html(self) -> str:
+        """HTML-код виджета лота."""
+        if callable(self._html):
+            self._html = self._html()
+        return self._html
+
+    @html.setter
+    def html(self, value: str | Callable[[], str]):
+        self._html = value
+
 
 class UserProfile:
     """
@@ -1316,6 +1374,7 @@ class Balance:
 
 class PaymentMethod:
     """Объект, который описывает платежное средства при рассчете цены для покупателя"""
+    __slots__ = ("name", "price", "currency", "position")
 
     def __init__(self, name: str | None, price: float, currency: Currency, position: int | None):
         self.name: str | None = name
@@ -1330,6 +1389,8 @@ class PaymentMethod:
 
 class CalcResult:
     """Класс, описывающий ответ на запрос о рассчете комиссии раздела."""
+    __slots__ = ("subcategory_type", "subcategory_id", "methods", "price", "min_price_with_commission",
+                 "min_price_currency", "account_currency")
 
     def __init__(self, subcategory_type: SubCategoryTypes, subcategory_id: int, methods: list[PaymentMethod],
                  price: float, min_price_with_commission: float | None, min_price_currency: Currency,
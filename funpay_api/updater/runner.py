@@ -7,12 +7,18 @@ if TYPE_CHECKING:
     from ..account import Account
 
 import json
+from functools import partial
 from loguru import logger
-from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
 
-from ..common import exceptions
+from ..common import exceptions, utils
 from .events import *
 
+_CONTACT_ITEMS = etree.XPath(f".//a[{utils.xpath_class('contact-item')}]")
+_CONTACT_ITEM_MESSAGE = etree.XPath(f".//div[{utils.xpath_class('contact-item-message')}]")
+_MEDIA_USER_NAME_TEXT = etree.XPath(f"string(.//div[{utils.xpath_class('media-user-name')}])", smart_strings=False)
+_TEXT = etree.XPath("string()", smart_strings=False)
+
 
 class Runner:
     """
@@ -131,7 +137,7 @@ class Runner:
         if response.status_code != 200:
             raise exceptions.RequestFailedError(response)
 
-        json_response = response.json()
+        json_response = utils.json_loads(response.content)
         logger.debug(f"Получены данные о событиях: {json_response}")
         return json_response
 
@@ -184,26 +190,27 @@ class Runner:
         """
         events, lcmc_events = [], []
         self.__last_msg_event_tag = obj.get("tag")
-        parser = BeautifulSoup(obj["data"]["html"], "lxml")
-        chats = parser.find_all("a", {"class": "contact-item"})
+        parser = lxml_html.fragment_fromstring(obj["data"]["html"], create_parent="div")
+        chats = _CONTACT_ITEMS(parser)
+        bot_character, old_bot_character = self.account.bot_character, self.account.old_bot_character
 
         # Получаем все изменившиеся чаты
         for chat in chats:
-            chat_id = int(chat["data-id"])
+            chat_id = int(chat.get("data-id"))
             # Если чат удален админами - скип.
-            if not (last_msg_text := chat.find("div", {"class": "contact-item-message"})):
+            if not (last_msg_text := _CONTACT_ITEM_MESSAGE(chat)):
                 continue
 
-            last_msg_text = last_msg_text.text
+            last_msg_text = _TEXT(last_msg_text[0])
 
             node_msg_id = int(chat.get('data-node-msg'))
             user_msg_id = int(chat.get('data-user-msg'))
             by_bot = False
             by_vertex = False
-            if last_msg_text.startswith(self.account.bot_character):
+            if last_msg_text.startswith(bot_character):
                 last_msg_text = last_msg_text[1:]
                 by_bot = True
-            elif last_msg_text.startswith(self.account.old_bot_character):
+            elif last_msg_text.startswith(old_bot_character):
                 last_msg_text = last_msg_text[1:]
                 by_vertex = True
             # если сообщение отправлено непрочитанным и вкл старый режим, то [0, 0, None] или [0, 0, "text"]
@@ -215,11 +222,12 @@ class Runner:
                 # значит сообщение отправлено ботом и оставлено непрочитанным - просто обновляем инфу
                 self.runner_last_messages[chat_id] = [node_msg_id, user_msg_id, last_msg_text_or_none]
                 continue
-            unread = True if "unread" in chat.get("class") else False
+            unread = "unread" in (chat.get("class") or "").split()
 
-            chat_with = chat.find("div", {"class": "media-user-name"}).text
-            chat_obj = types.ChatShortcut(chat_id, chat_with, last_msg_text, node_msg_id,
-                                          user_msg_id, unread, str(chat))
+            chat_with = _MEDIA_USER_NAME_TEXT(chat)
+            chat_obj = types.ChatShortcut(chat_id, chat_with, last_msg_text, node_msg_id, user_msg_id, unread,
+                                          partial(etree.tostring, chat, encoding="unicode", method="html",
+                                                  with_tail=False))
             if last_msg_text_or_none is not None:
                 chat_obj.last_by_bot = by_bot
                 chat_obj.last_by_vertex = by_vertex
@@ -1,5 +1,7 @@
 import asyncio
+import pickle
 from funpay_api import AsyncAccount, SyncAccount
+from funpay_api.common import exceptions
 from funpay_api.common.exceptions import funpay_apiError
 
 # NOTE: This is a dummy key and is expected to fail authentication.
@@ -36,7 +38,36 @@ def test_sync_client():
     print("--- SyncAccount Test Complete ---\n")
 
 
+class _DummyResponse:
+    status_code = 400
+    text = "error body"
+
+
+def test_exceptions_pickling():
+    print("--- Testing exceptions pickling ---")
+    response = _DummyResponse()
+    errors = [
+        exceptions.RequestFailedError(response),
+        exceptions.ImageUploadError(response, "message"),
+        exceptions.MessageNotDeliveredError(response, "message", 1),
+        exceptions.FeedbackEditingError(response, "message", "ORDER"),
+        exceptions.RefundError(response, "message", "ORDER"),
+        exceptions.WithdrawError(response, "message"),
+        exceptions.RaiseError(response, "category", "message", 60),
+        exceptions.LotParsingError(response, "message", 1),
+        exceptions.LotSavingError(response, "message", 1, {"field": "error"}),
+    ]
+    for error in errors:
+        restored = pickle.loads(pickle.dumps(error))
+        assert type(restored) is type(error) and restored.args == error.args, type(error).__name__
+        assert (restored.status_code, restored.response_text) == (error.status_code, error.response_text)
+        assert str(restored) == str(error), type(error).__name__
+    print(f"{len(errors)} exceptions survived a pickle round trip.")
+    print("--- Exceptions Pickling Test Complete ---\n")
+
+
 async def main():
+    test_exceptions_pickling()
     await test_async_client()
     # Run the synchronous test in a separate thread to avoid event loop conflicts
     loop = asyncio.get_event_loop()